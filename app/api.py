@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import os
 from pathlib import Path
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from .config import Settings
 from .auth import require_api_key
+from .capture import TrafficCapture
 from .models import SpeechEvent
 from .dedupe import DedupeGate
+from .jobs import JobEvents
 from .queue import SpeechQueue
+from .tracing import profiler, tracer
 
 router = APIRouter()
 
@@ -25,6 +29,14 @@ def get_queue() -> SpeechQueue:
     raise RuntimeError("Queue dependency not wired")
 
 
+def get_jobs() -> JobEvents:
+    raise RuntimeError("Jobs dependency not wired")
+
+
+def get_capture() -> Optional[TrafficCapture]:
+    return None  # capture is opt-in; main.py overrides when enabled
+
+
 def _get_available_voices(voices_dir: str) -> list[str]:
     """Scan the voices directory for available .onnx files."""
     voices_path = Path(voices_dir)
@@ -63,14 +75,15 @@ def handshake(settings: Settings = Depends(get_settings)) -> dict:
     return {
         "ok": True,
         "discovery": {
-            "enabled": os.getenv("BELLPHONICS_DISCOVERY_ENABLED", "false").lower() == "true",
-            "instance_name": os.getenv("BELLPHONICS_DISCOVERY_NAME", "Bellphonics"),
-            "host": os.getenv("BELLPHONICS_DISCOVERY_HOST", ""),
-            "zone": os.getenv("BELLPHONICS_DISCOVERY_ZONE", ""),
-            "subzone": os.getenv("BELLPHONICS_DISCOVERY_SUBZONE", ""),
+            "enabled": settings.discovery_enabled,
+            "instance_name": settings.discovery_name,
+            "host": settings.discovery_host,
+            "zone": settings.discovery_zone,
+            "subzone": settings.discovery_subzone,
             "port": settings.bind_port,
         },
         "tts": tts_info,
+        "sinks": sorted(settings.sinks),
         "version": "0.1.0",
     }
 
@@ -81,6 +94,8 @@ async def speak(
     settings: Settings = Depends(get_settings),
     gate: DedupeGate = Depends(get_gate),
     q: SpeechQueue = Depends(get_queue),
+    jobs: JobEvents = Depends(get_jobs),
+    capture: Optional[TrafficCapture] = Depends(get_capture),
     _: None = Depends(lambda x_api_key=None: None),  # placeholder for FastAPI signature
 ):
     # auth (done explicitly so we can pass settings)
@@ -89,8 +104,101 @@ async def speak(
     # (We can’t inject Header here cleanly without repetition, so we do it in main with a dependency.)
     # This function assumes auth already ran.
 
-    if not gate.allow(event.event_id):
-        return {"ok": True, "accepted": False, "reason": "duplicate_event"}
+    tracer.annotate(event_id=event.event_id, severity=event.severity)
+
+    # Reject unknown broadcast targets before the event_id is consumed, so a corrected retry is accepted
+    if event.targets:
+        if not q.can_broadcast():
+            raise HTTPException(status_code=422, detail="The configured TTS backend cannot play on targets")
+        unknown = q.unknown_targets(event.targets)
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown target(s): {', '.join(unknown)}")
+        if not q.resolve_targets(event.targets):
+            # e.g. ["*"] with no sinks configured: nothing would play, yet the job would report done
+            raise HTTPException(status_code=422, detail="No sinks configured for targets")
+
+    with tracer.span("dedupe.allow"):
+        allowed = gate.allow(event.event_id)
+
+    if not allowed:
+        # Point retries at the original job (if still remembered) so they can follow it
+        original_job = jobs.job_for_event(event.event_id)
+        if capture:
+            capture.record_arrival("duplicate", event, job_id=original_job)
+        return {
+            "ok": True,
+            "accepted": False,
+            "reason": "duplicate_event",
+            "job_id": original_job,
+        }
+
+    with tracer.span("queue.enqueue"):
+        job_id = await q.enqueue(event)
+    tracer.annotate(job_id=job_id)
+    if capture:
+        capture.record_arrival("accepted", event, job_id=job_id)
+    return {"ok": True, "accepted": True, "job_id": job_id}
+
+
+@router.get("/jobs/events")
+async def job_events(
+    job_id: Optional[list[str]] = Query(default=None),
+    jobs: JobEvents = Depends(get_jobs),
+):
+    """
+    Server-Sent Events stream of job lifecycle events.
+    Pass `job_id` (repeatable) to follow specific jobs; omit it to follow all jobs.
+    """
+    return StreamingResponse(
+        jobs.stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str, jobs: JobEvents = Depends(get_jobs)) -> dict:
+    evt = jobs.last(job_id)
+    if evt is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return evt
+
+
+@router.get("/tts/stats")
+def tts_stats(settings: Settings = Depends(get_settings), q: SpeechQueue = Depends(get_queue)) -> dict:
+    """Per-voice load time, cold vs warm inference timings, and degrade policy state."""
+    stats = getattr(q.engine, "stats", None)
+    return {
+        "backend": settings.tts_backend,
+        "voices": stats() if callable(stats) else {},
+        "degrade": q.degrade.status() if q.degrade is not None else None,
+    }
+
+
+@router.get("/debug/traces")
+def debug_traces(limit: int = Query(default=20, ge=1, le=1000), event_id: Optional[str] = None) -> dict:
+    """Recent per-event span timelines from the in-memory ring buffer."""
+    return {**tracer.status(), "timelines": tracer.timelines(limit=limit, event_id=event_id)}
+
+
+@router.post("/debug/tracing")
+def debug_tracing(enabled: bool) -> dict:
+    """Turn span tracing on or off at runtime."""
+    tracer.configure(enabled=enabled)
+    return tracer.status()
+
+
+@router.post("/debug/profile")
+def debug_profile_start(
+    seconds: float = Query(default=10.0, gt=0, le=300),
+    interval_ms: float = Query(default=5.0, ge=1.0, le=1000.0),
+) -> dict:
+    """Run the sampling profiler for `seconds`; fetch results with GET /debug/profile."""
+    if not profiler.start(seconds, interval_ms=interval_ms):
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    return profiler.report(top=0)
+
 
-    await q.enqueue(event)
-    return {"ok": True, "accepted": True}
+@router.get("/debug/profile")
+def debug_profile(top: int = Query(default=50, ge=1, le=1000)) -> dict:
+    return profiler.report(top=top)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import io
+import logging
+import shlex
+import subprocess
+import sys
+import wave
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from .tracing import tracer
+
+log = logging.getLogger("bellphonics.audio")
+
+
+@dataclass(frozen=True)
+class Audio:
+    """
+    Rendered speech: 16-bit signed little-endian PCM.
+    `pcm` is immutable bytes, so one rendition can be shared by every sink.
+    """
+
+    pcm: bytes
+    sample_rate: int
+    channels: int = 1
+    sample_width: int = 2
+
+    @property
+    def duration_s(self) -> float:
+        frame = self.channels * self.sample_width
+        return len(self.pcm) / float(frame * self.sample_rate) if self.sample_rate else 0.0
+
+    def to_wav(self, pcm: Optional[bytes] = None) -> bytes:
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(self.sample_width)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(self.pcm if pcm is None else pcm)
+        return buf.getvalue()
+
+
+def scale_pcm16(pcm: bytes, volume: Optional[float]) -> bytes:
+    """Return `pcm` attenuated by `volume` (0..1). Full volume returns the original buffer untouched."""
+    if volume is None or volume >= 1.0:
+        return pcm
+    if volume <= 0.0:
+        return bytes(len(pcm))
+    samples = array("h")
+    samples.frombytes(pcm)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    scaled = array("h", [int(s * volume) for s in samples])
+    if sys.byteorder == "big":
+        scaled.byteswap()
+    return scaled.tobytes()
+
+
+class AudioSink(Protocol):
+    name: str
+
+    def play(self, audio: Audio, *, volume: Optional[float] = None) -> None: ...
+
+
+@dataclass
+class MockSink:
+    name: str
+    volume: float = 1.0
+
+    def play(self, audio: Audio, *, volume: Optional[float] = None) -> None:
+        log.info(
+            "[MOCK SINK %s] %.2fs of audio at volume=%.2f",
+            self.name, audio.duration_s, (1.0 if volume is None else volume) * self.volume,
+        )
+
+
+@dataclass
+class WinsoundSink:
+    """Default Windows output device (the same path single-target Piper playback uses)."""
+
+    name: str
+    volume: float = 1.0
+
+    def play(self, audio: Audio, *, volume: Optional[float] = None) -> None:
+        import winsound
+
+        pcm = scale_pcm16(audio.pcm, (1.0 if volume is None else volume) * self.volume)
+        winsound.PlaySound(audio.to_wav(pcm), winsound.SND_MEMORY)
+
+
+@dataclass
+class CommandSink:
+    """
+    Pipes a WAV stream to a player command's stdin, e.g.
+    `aplay -q -D plughw:1,0 -` or `paplay --device=kitchen`.
+    """
+
+    name: str
+    command: str
+    volume: float = 1.0
+
+    def play(self, audio: Audio, *, volume: Optional[float] = None) -> None:
+        pcm = scale_pcm16(audio.pcm, (1.0 if volume is None else volume) * self.volume)
+        proc = subprocess.run(shlex.split(self.command), input=audio.to_wav(pcm), check=False, capture_output=True)
+        if proc.returncode != 0:
+            err = proc.stderr.decode("utf-8", "replace").strip()
+            raise RuntimeError(f"Sink {self.name!r} exited with {proc.returncode}: {err}")
+
+
+def build_sinks(cfg: dict[str, dict], *, backend: str) -> dict[str, AudioSink]:
+    """
+    Build named output sinks from config: {"kitchen": {"command": "...", "volume": 0.8}}.
+    The mock backend only ever logs; otherwise sinks without a command use the default device.
+    Only one sink may do that: winsound.PlaySound is process-wide, so a second
+    call cuts off the first and parallel playback would silence all but one.
+    """
+    sinks: dict[str, AudioSink] = {}
+    default_device: Optional[str] = None
+    for name, opts in cfg.items():
+        volume = float(opts.get("volume", 1.0))
+        if not 0.0 <= volume <= 1.0:
+            raise RuntimeError(f"Sink {name!r} volume must be between 0 and 1")
+        command = (opts.get("command") or "").strip()
+        if backend == "mock":
+            sinks[name] = MockSink(name=name, volume=volume)
+        elif command:
+            sinks[name] = CommandSink(name=name, command=command, volume=volume)
+        else:
+            if default_device is not None:
+                raise RuntimeError(
+                    f"Sinks {default_device!r} and {name!r} both use the default output device; "
+                    "give all but one a command"
+                )
+            default_device = name
+            sinks[name] = WinsoundSink(name=name, volume=volume)
+    return sinks
+
+
+def play_on(sink: AudioSink, audio: Audio, volume: Optional[float]) -> None:
+    with tracer.span("sink.play", sink=sink.name):
+        sink.play(audio, volume=volume)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import time
+from pathlib import Path
+from typing import IO, Any, Iterator, Literal, Optional
+
+from .jobs import TERMINAL_STATES
+from .models import SpeechEvent
+
+log = logging.getLogger("bellphonics.capture")
+
+Outcome = Literal["accepted", "duplicate", "rate_limited", "spoken", "dropped"]
+
+# Arrival outcomes carry the full event so replay can re-send it
+ARRIVAL_OUTCOMES = frozenset({"accepted", "duplicate", "rate_limited"})
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficCapture:
+    """
+    Opt-in log of /speak traffic for replay: one compact JSON object per line.
+
+        {"ts": 1737024000.123, "o": "accepted", "id": "evt-001", "job": "3f2c...", "e": {...}}
+        {"ts": 1737024002.301, "o": "spoken", "id": "evt-001", "job": "3f2c...", "ms": {...}}
+
+    Files ending in .gz are gzip-compressed. Records are appended, so one
+    file can span restarts.
+    """
+
+    FLUSH_INTERVAL_S = 1.0
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f: Optional[IO[str]] = _open(self.path, "a")
+        self._last_flush = time.monotonic()
+        log.info("Capturing /speak traffic to %s", self.path)
+
+    def _write(self, rec: dict[str, Any]) -> None:
+        if self._f is None:
+            return
+        self._f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        now = time.monotonic()
+        if (now - self._last_flush) >= self.FLUSH_INTERVAL_S:
+            self._f.flush()
+            self._last_flush = now
+
+    def record_arrival(self, outcome: Outcome, event: SpeechEvent | dict, *, job_id: Optional[str] = None) -> None:
+        e = event.model_dump(mode="json", exclude_none=True) if isinstance(event, SpeechEvent) else event
+        rec: dict[str, Any] = {"ts": time.time(), "o": outcome, "id": e.get("event_id"), "e": e}
+        if job_id:
+            rec["job"] = job_id
+        self._write(rec)
+
+    def on_job_event(self, evt: dict) -> None:
+        """JobEvents listener: records how each accepted event finished."""
+        state = evt.get("state")
+        if state not in TERMINAL_STATES:
+            return
+        rec: dict[str, Any] = {
+            "ts": evt["ts"],
+            "o": "spoken" if state == "done" else "dropped",
+            "id": evt["event_id"],
+            "job": evt["job_id"],
+        }
+        timings = {k: v for k, v in evt.items() if k.endswith("_ms")}
+        if timings:
+            rec["ms"] = timings
+        if evt.get("reason"):
+            rec["reason"] = evt["reason"]
+        self._write(rec)
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def read_capture(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yield capture records, skipping lines that don't parse (e.g. a torn final write)."""
+    with _open(Path(path), "r") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                log.warning("Skipping unreadable capture line %d", n)
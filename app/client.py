@@ -0,0 +1,323 @@
+"""
+Async client for publishing speech events to Bellphonics nodes.
+
+    async with BellphonicsClient(api_key="...") as bell:           # nodes found via mDNS
+        await bell.speak("Delivery at the front door", zone="house", subzone="porch")
+
+    async with BellphonicsClient(api_key="...", nodes=["http://192.168.1.60:8099"]) as bell:
+        await bell.speak_many([{"text": "One"}, {"text": "Two"}])
+
+Requires the `client` extra: pip install -e .[client]
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+import httpx
+from zeroconf import IPVersion, ServiceStateChange, Zeroconf
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
+
+from .discovery import SERVICE_TYPE
+from .models import SpeechEvent
+
+log = logging.getLogger("bellphonics.client")
+
+
+def new_event_id() -> str:
+    return uuid.uuid4().hex
+
+
+@dataclass(frozen=True)
+class Node:
+    url: str  # e.g. http://192.168.1.60:8099
+    name: str = ""
+    zone: str = ""
+    subzone: str = ""
+
+    def matches(self, zone: Optional[str], subzone: Optional[str]) -> bool:
+        return (zone is None or self.zone == zone) and (subzone is None or self.subzone == subzone)
+
+
+@dataclass
+class SpeakResult:
+    node: str
+    event_id: str
+    accepted: bool
+    job_id: Optional[str] = None
+    duplicate: bool = False  # the node had already seen this event_id
+    reason: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 1
+
+
+@dataclass
+class _Discovered:
+    node: Node
+    last_seen: float = field(default_factory=time.monotonic)
+
+
+class NodeDiscovery:
+    """
+    Cached view of Bellphonics nodes advertised over mDNS.
+    The browser keeps the cache current as nodes come and go; a background
+    task also re-resolves known nodes and expires ones that stop answering.
+    """
+
+    def __init__(self, *, service_type: str = SERVICE_TYPE, refresh_s: float = 60.0, stale_after_s: float = 180.0):
+        self.service_type = service_type
+        self.refresh_s = refresh_s
+        self.stale_after_s = stale_after_s
+        self._nodes: dict[str, _Discovered] = {}  # mDNS instance name -> node
+        self._changed = asyncio.Event()
+        self._aiozc: Optional[AsyncZeroconf] = None
+        self._browser: Optional[AsyncServiceBrowser] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._aiozc is not None:
+            return
+        self._aiozc = AsyncZeroconf(ip_version=IPVersion.V4Only)
+        self._browser = AsyncServiceBrowser(self._aiozc.zeroconf, [self.service_type], handlers=[self._on_change])
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        for task in list(self._pending):
+            task.cancel()
+        if self._browser:
+            await self._browser.async_cancel()
+            self._browser = None
+        if self._aiozc:
+            await self._aiozc.async_close()
+            self._aiozc = None
+
+    def nodes(self, *, zone: Optional[str] = None, subzone: Optional[str] = None) -> list[Node]:
+        return [d.node for d in self._nodes.values() if d.node.matches(zone, subzone)]
+
+    async def wait_for_nodes(self, *, zone: Optional[str] = None, subzone: Optional[str] = None, timeout_s: float = 3.0) -> list[Node]:
+        """Return matching nodes, waiting up to `timeout_s` for the first one to appear."""
+        deadline = time.monotonic() + timeout_s
+        while True:
+            found = self.nodes(zone=zone, subzone=subzone)
+            remaining = deadline - time.monotonic()
+            if found or remaining <= 0:
+                return found
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_change(self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange) -> None:
+        if state_change is ServiceStateChange.Removed:
+            if self._nodes.pop(name, None) is not None:
+                log.info("Bellphonics node removed: %s", name)
+            return
+        task = asyncio.ensure_future(self._resolve(name))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _resolve(self, name: str) -> bool:
+        if self._aiozc is None:
+            return False
+        info = AsyncServiceInfo(self.service_type, name)
+        if not await info.async_request(self._aiozc.zeroconf, 3000):
+            return False
+        addresses = info.parsed_addresses()
+        if not addresses or not info.port:
+            return False
+        props = {
+            k.decode("utf-8", "replace"): (v or b"").decode("utf-8", "replace")
+            for k, v in (info.properties or {}).items()
+        }
+        node = Node(
+            url=f"http://{addresses[0]}:{info.port}",
+            name=name,
+            zone=props.get("zone", ""),
+            subzone=props.get("subzone", ""),
+        )
+        if name not in self._nodes:
+            log.info("Bellphonics node found: %s at %s (zone=%s subzone=%s)", name, node.url, node.zone, node.subzone)
+        self._nodes[name] = _Discovered(node=node)
+        self._changed.set()
+        return True
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_s)
+            for name in list(self._nodes):
+                try:
+                    await self._resolve(name)
+                except Exception:
+                    log.debug("Re-resolving %s failed", name, exc_info=True)
+            now = time.monotonic()
+            for name, d in list(self._nodes.items()):
+                if (now - d.last_seen) > self.stale_after_s:
+                    log.info("Bellphonics node expired: %s", name)
+                    self._nodes.pop(name, None)
+
+
+class BellphonicsClient:
+    """
+    Publishes SpeechEvents over pooled keep-alive connections.
+
+    Retries are safe because every attempt for an event reuses the same
+    event_id and goes to the same node: if an earlier attempt was accepted,
+    the node's DedupeGate answers `duplicate_event` instead of speaking twice,
+    and the retry is reported as accepted.
+    """
+
+    # Fast retries only where the next attempt may succeed. 429 is handled
+    # separately: the node's limiter is a shared fixed window that also counts
+    # rejected attempts, so retrying early only burns more of it.
+    RETRY_STATUS = frozenset({500, 502, 503, 504})
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        nodes: Optional[Iterable[str | Node]] = None,
+        discovery: Optional[NodeDiscovery] = None,
+        timeout_s: float = 5.0,
+        retries: int = 3,
+        backoff_s: float = 0.2,
+        max_connections: int = 20,
+        discovery_timeout_s: float = 3.0,
+        max_retry_after_s: float = 0.0,
+    ):
+        self.static_nodes = [n if isinstance(n, Node) else Node(url=n.rstrip("/")) for n in (nodes or [])]
+        # Without a static node list, discover nodes over mDNS
+        self.discovery = discovery or (None if self.static_nodes else NodeDiscovery())
+        self._owns_discovery = discovery is None and self.discovery is not None
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.discovery_timeout_s = discovery_timeout_s
+        self.max_retry_after_s = max_retry_after_s  # wait out a 429's Retry-After up to this long (0: never)
+        self._http = httpx.AsyncClient(
+            headers={"X-API-Key": api_key},
+            timeout=timeout_s,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def __aenter__(self) -> "BellphonicsClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def start(self) -> None:
+        if self._owns_discovery and self.discovery is not None:
+            await self.discovery.start()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+        if self._owns_discovery and self.discovery is not None:
+            await self.discovery.stop()
+
+    async def nodes(self, *, zone: Optional[str] = None, subzone: Optional[str] = None) -> list[Node]:
+        if self.static_nodes:
+            return [n for n in self.static_nodes if n.matches(zone, subzone)]
+        if self.discovery is None:
+            return []
+        return await self.discovery.wait_for_nodes(zone=zone, subzone=subzone, timeout_s=self.discovery_timeout_s)
+
+    async def speak(
+        self,
+        text: str,
+        *,
+        zone: Optional[str] = None,
+        subzone: Optional[str] = None,
+        event_id: Optional[str] = None,
+        **fields: Any,
+    ) -> list[SpeakResult]:
+        """
+        Send one event to every node matching zone/subzone.
+        Extra keyword arguments are SpeechEvent fields (severity, voice, volume, targets, ...).
+        All nodes receive the same event_id, so each node dedupes its own retries.
+        """
+        event = SpeechEvent(event_id=event_id or new_event_id(), ts=time.time(), text=text, **fields)
+        payload = event.model_dump(mode="json", exclude_none=True)
+        targets = await self.nodes(zone=zone, subzone=subzone)
+        if not targets:
+            log.warning("No Bellphonics nodes for zone=%s subzone=%s; dropping event_id=%s", zone, subzone, event.event_id)
+            return []
+        return list(await asyncio.gather(*(self._post(node, payload) for node in targets)))
+
+    async def speak_many(self, events: Iterable[dict[str, Any]], *, concurrency: int = 8) -> list[list[SpeakResult]]:
+        """
+        Send a batch of events, pipelined over the connection pool with at most
+        `concurrency` events in flight. Each item holds `speak()` keyword arguments.
+        Results are returned in input order.
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(kwargs: dict[str, Any]) -> list[SpeakResult]:
+            async with sem:
+                return await self.speak(**kwargs)
+
+        return list(await asyncio.gather(*(one(dict(e)) for e in events)))
+
+    async def _post(self, node: Node, payload: dict[str, Any]) -> SpeakResult:
+        event_id = payload["event_id"]
+        delay = self.backoff_s
+        attempt = 0
+        while True:
+            attempt += 1
+            status: Optional[int] = None
+            try:
+                resp = await self._http.post(f"{node.url}/speak", json=payload)
+            except httpx.TransportError as e:
+                error = str(e) or type(e).__name__
+            else:
+                status = resp.status_code
+                if status == 200:
+                    body = resp.json()
+                    if body.get("accepted"):
+                        return SpeakResult(node.url, event_id, True, job_id=body.get("job_id"), status_code=status, attempts=attempt)
+                    duplicate = body.get("reason") == "duplicate_event"
+                    return SpeakResult(
+                        node.url,
+                        event_id,
+                        # On a retry, a duplicate means an earlier attempt got through
+                        accepted=duplicate and attempt > 1,
+                        job_id=body.get("job_id"),
+                        duplicate=duplicate,
+                        reason=body.get("reason"),
+                        status_code=status,
+                        attempts=attempt,
+                    )
+                error = f"HTTP {status}"
+                if status == 429:
+                    wait = self._retry_after(resp)
+                    if wait is None or attempt > self.retries:
+                        return SpeakResult(node.url, event_id, False, status_code=status, error=error, attempts=attempt)
+                    log.debug("event_id=%s rate limited on %s; retrying in %.0fs", event_id, node.url, wait)
+                    await asyncio.sleep(wait)
+                    continue
+                if status not in self.RETRY_STATUS:
+                    return SpeakResult(node.url, event_id, False, status_code=status, error=error, attempts=attempt)
+
+            if attempt > self.retries:
+                return SpeakResult(node.url, event_id, False, status_code=status, error=error, attempts=attempt)
+            log.debug("Retrying event_id=%s on %s after %s (attempt %d)", event_id, node.url, error, attempt)
+            await asyncio.sleep(delay * (0.5 + random.random()))
+            delay *= 2
+
+    def _retry_after(self, resp: httpx.Response) -> Optional[float]:
+        """Seconds to wait before retrying a 429, or None to give up now."""
+        try:
+            wait = float(resp.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+        return wait if 0 <= wait <= self.max_retry_after_s else None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import json
 import os
 
 
@@ -21,7 +22,31 @@ class Settings:
     default_cooldown_s: int = 20
     dedupe_ttl_s: int = 300
 
+    # Request gating: IPs or DNS names (empty allows all), requests per minute
+    allowlist: frozenset[str] = frozenset()
+    rate_limit_per_min: int = 20
+
+    # mDNS advertisement
+    discovery_enabled: bool = False
+    discovery_name: str = "Bellphonics"
+    discovery_host: str = ""
+    discovery_zone: str = ""
+    discovery_subzone: str = ""
+
     tts_backend: str = "mock"
+
+    # Named output sinks for broadcast: name -> {"command": "...", "volume": 0.8}
+    sinks: dict[str, dict] = field(default_factory=dict)
+
+    # Per-subscriber buffer for the /jobs/events stream
+    job_events_buffer: int = 100
+
+    # Traffic capture for replay (JSON lines, .gz to compress); empty disables
+    capture_path: str = ""
+
+    # Span tracing (debug endpoints under /debug)
+    trace_enabled: bool = False
+    trace_capacity: int = 200
     
     # Piper TTS settings
     piper_exe: str = "piper"
@@ -30,23 +55,126 @@ class Settings:
     piper_voices_dir: str = "app/tts/voicepacks"
     piper_default_voice: str = "en_GB-alba-medium"
 
+    # Piper ONNX Runtime session tuning (0 threads = runtime default)
+    piper_intra_op_threads: int = 0
+    piper_inter_op_threads: int = 0
+    piper_graph_opt_level: str = "all"
+    piper_cpu_mem_arena: bool = True
+    piper_warmup: bool = False
+    # Voices loaded (and warmed up) at startup besides the default
+    piper_preload_voices: tuple[str, ...] = ()
+    # Per-voice overrides: voice name -> {"intra_op_threads": 2, ...}
+    piper_voice_session_options: dict[str, dict] = field(default_factory=dict)
+
+    # Load-aware degradation: non-alert jobs switch to this voice under backlog; empty disables
+    degrade_fallback_voice: str = ""
+    degrade_queue_depth: int = 3
+    degrade_synth_ms: int = 2000
+    degrade_recover_depth: int = 0
+
+    # Pre-rendered phrase store directory (see app.prerender); empty disables
+    phrase_store: str = ""
 
-def load_settings() -> Settings:
+
+def _env_json_map(key: str) -> dict[str, dict]:
+    """Parse an env var holding a JSON object of name -> options object."""
+    raw = _env(key, "") or ""
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"{key} is not valid JSON: {e}") from e
+    if not isinstance(parsed, dict) or not all(isinstance(v, dict) for v in parsed.values()):
+        raise RuntimeError(f"{key} must map names to option objects")
+    return parsed
+
+
+# Keys accepted in BELLPHONICS_PIPER_VOICE_SESSION_OPTIONS, mirroring PiperSessionOptions
+_PIPER_SESSION_OPTION_TYPES: dict[str, type] = {
+    "intra_op_threads": int,
+    "inter_op_threads": int,
+    "graph_opt_level": str,
+    "cpu_mem_arena": bool,
+}
+_PIPER_GRAPH_OPT_LEVELS = ("disable", "basic", "extended", "all")
+
+
+def _piper_voice_session_options(key: str) -> dict[str, dict]:
+    """Parse per-voice session overrides, rejecting unknown keys and mistyped values up front."""
+    parsed = _env_json_map(key)
+    for voice, opts in parsed.items():
+        for name, value in opts.items():
+            expected = _PIPER_SESSION_OPTION_TYPES.get(name)
+            if expected is None:
+                raise RuntimeError(
+                    f"{key}: unknown option {name!r} for voice {voice!r} "
+                    f"(expected one of: {', '.join(_PIPER_SESSION_OPTION_TYPES)})"
+                )
+            # bool is an int subclass, so check it explicitly for the thread counts
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                raise RuntimeError(f"{key}: {voice!r} option {name!r} must be {expected.__name__}")
+            if expected is int and value < 0:
+                raise RuntimeError(f"{key}: {voice!r} option {name!r} must not be negative")
+        level = opts.get("graph_opt_level")
+        if level is not None and level not in _PIPER_GRAPH_OPT_LEVELS:
+            raise RuntimeError(
+                f"{key}: {voice!r} graph_opt_level must be one of: {', '.join(_PIPER_GRAPH_OPT_LEVELS)}"
+            )
+    return parsed
+
+
+def load_settings(*, require_api_key: bool = True) -> Settings:
+    """
+    Read settings from the environment. Offline tools that never serve
+    requests (e.g. app.prerender) pass require_api_key=False.
+    """
     api_key = _env("BELLPHONICS_API_KEY", "") or ""
-    if not api_key:
+    if not api_key and require_api_key:
         # Fail closed: service should not accept unauthenticated speech.
         raise RuntimeError("BELLPHONICS_API_KEY must be set")
 
+    job_events_buffer = int(_env("BELLPHONICS_JOB_EVENTS_BUFFER", "100") or "100")
+    if job_events_buffer < 1:
+        # asyncio.Queue(maxsize=0) is unbounded, which would let slow subscribers grow without limit
+        raise RuntimeError("BELLPHONICS_JOB_EVENTS_BUFFER must be at least 1")
+
     return Settings(
         api_key=api_key,
         bind_host=_env("BELLPHONICS_BIND_HOST", "0.0.0.0") or "0.0.0.0",
         bind_port=int(_env("BELLPHONICS_BIND_PORT", "8099") or "8099"),
         default_cooldown_s=int(_env("BELLPHONICS_DEFAULT_COOLDOWN_S", "20") or "20"),
         dedupe_ttl_s=int(_env("BELLPHONICS_DEDUPE_TTL_S", "300") or "300"),
+        allowlist=frozenset(ip.strip() for ip in (_env("BELLPHONICS_ALLOWLIST", "") or "").split(",") if ip.strip()),
+        rate_limit_per_min=int(_env("BELLPHONICS_RATE_LIMIT_PER_MIN", "20") or "20"),
+        discovery_enabled=(_env("BELLPHONICS_DISCOVERY_ENABLED", "false") or "false").lower() == "true",
+        discovery_name=_env("BELLPHONICS_DISCOVERY_NAME", "Bellphonics") or "Bellphonics",
+        discovery_host=_env("BELLPHONICS_DISCOVERY_HOST", "") or "",
+        discovery_zone=_env("BELLPHONICS_DISCOVERY_ZONE", "") or "",
+        discovery_subzone=_env("BELLPHONICS_DISCOVERY_SUBZONE", "") or "",
+        job_events_buffer=job_events_buffer,
+        capture_path=_env("BELLPHONICS_CAPTURE_PATH", "") or "",
+        trace_enabled=(_env("BELLPHONICS_TRACE_ENABLED", "false") or "false").lower() == "true",
+        trace_capacity=int(_env("BELLPHONICS_TRACE_CAPACITY", "200") or "200"),
+        sinks=_env_json_map("BELLPHONICS_SINKS"),
         tts_backend=(_env("BELLPHONICS_TTS_BACKEND", "mock") or "mock").lower(),
         piper_exe=_env("BELLPHONICS_PIPER_EXE", "piper") or "piper",
         piper_model=_env("BELLPHONICS_PIPER_MODEL", "") or "",
         piper_speaker_id=int(_env("BELLPHONICS_PIPER_SPEAKER_ID", "0") or "0"),
         piper_voices_dir=_env("BELLPHONICS_PIPER_VOICES_DIR", "app/tts/voicepacks") or "app/tts/voicepacks",
         piper_default_voice=_env("BELLPHONICS_PIPER_DEFAULT_VOICE", "en_GB-alba-medium") or "en_GB-alba-medium",
+        piper_intra_op_threads=int(_env("BELLPHONICS_PIPER_INTRA_OP_THREADS", "0") or "0"),
+        piper_inter_op_threads=int(_env("BELLPHONICS_PIPER_INTER_OP_THREADS", "0") or "0"),
+        piper_graph_opt_level=(_env("BELLPHONICS_PIPER_GRAPH_OPT_LEVEL", "all") or "all").lower(),
+        piper_cpu_mem_arena=(_env("BELLPHONICS_PIPER_CPU_MEM_ARENA", "true") or "true").lower() == "true",
+        piper_warmup=(_env("BELLPHONICS_PIPER_WARMUP", "false") or "false").lower() == "true",
+        piper_preload_voices=tuple(
+            v.strip() for v in (_env("BELLPHONICS_PIPER_PRELOAD_VOICES", "") or "").split(",") if v.strip()
+        ),
+        piper_voice_session_options=_piper_voice_session_options("BELLPHONICS_PIPER_VOICE_SESSION_OPTIONS"),
+        phrase_store=_env("BELLPHONICS_PHRASE_STORE", "") or "",
+        degrade_fallback_voice=_env("BELLPHONICS_DEGRADE_FALLBACK_VOICE", "") or "",
+        degrade_queue_depth=int(_env("BELLPHONICS_DEGRADE_QUEUE_DEPTH", "3") or "3"),
+        degrade_synth_ms=int(_env("BELLPHONICS_DEGRADE_SYNTH_MS", "2000") or "2000"),
+        degrade_recover_depth=int(_env("BELLPHONICS_DEGRADE_RECOVER_DEPTH", "0") or "0"),
     )
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from .models import SpeechEvent
+
+log = logging.getLogger("bellphonics.degrade")
+
+
+@dataclass(frozen=True)
+class DegradeConfig:
+    fallback_voice: str
+    queue_depth: int = 3  # enter degraded mode at this many waiting jobs...
+    synth_ms: float = 2000.0  # ...or with any backlog while recent synthesis is this slow
+    recover_depth: int = 0  # leave degraded mode once the backlog is this small
+    ewma_alpha: float = 0.3
+
+
+class DegradePolicy:
+    """
+    Load-aware voice downgrade.
+
+    Tracks an EWMA of synthesis time and looks at queue depth when each job
+    starts. Under backlog, non-alert jobs switch to a fast, preloaded fallback
+    voice unless a pre-rendered copy of the requested phrase exists. Alerts
+    always keep their requested voice.
+    """
+
+    def __init__(self, cfg: DegradeConfig):
+        self.cfg = cfg
+        self.degraded = False
+        self.synth_ms_ewma: Optional[float] = None
+        self.degraded_jobs = 0
+        self.transitions = 0
+
+    def observe(self, synth_ms: float) -> None:
+        if self.synth_ms_ewma is None:
+            self.synth_ms_ewma = synth_ms
+        else:
+            a = self.cfg.ewma_alpha
+            self.synth_ms_ewma = a * synth_ms + (1 - a) * self.synth_ms_ewma
+
+    def _update_state(self, depth: int) -> str:
+        slow = self.synth_ms_ewma is not None and self.synth_ms_ewma >= self.cfg.synth_ms
+        if not self.degraded:
+            if depth >= self.cfg.queue_depth:
+                reason = f"queue_depth={depth}"
+            elif depth > 0 and slow:
+                reason = f"synth_ms_ewma={self.synth_ms_ewma:.0f}"
+            else:
+                return ""
+            self.degraded = True
+            self.transitions += 1
+            log.warning("Entering degraded mode (%s): non-alert jobs use voice %s", reason, self.cfg.fallback_voice)
+            return reason
+        if depth <= self.cfg.recover_depth:
+            self.degraded = False
+            self.transitions += 1
+            log.info("Leaving degraded mode (queue_depth=%d)", depth)
+            return ""
+        return f"queue_depth={depth}"
+
+    def decide(self, event: SpeechEvent, *, depth: int, default_voice: Optional[str], cached: bool) -> Optional[dict]:
+        """
+        Return the degradation applied to `event` (or None) given the number of
+        jobs still waiting behind it. `cached` means a pre-rendered copy exists.
+        """
+        reason = self._update_state(depth)
+        if not self.degraded or event.severity == "alert" or cached:
+            return None
+        requested = event.voice or default_voice
+        if requested == self.cfg.fallback_voice:
+            return None
+        self.degraded_jobs += 1
+        return {"from": requested, "to": self.cfg.fallback_voice, "reason": reason}
+
+    def status(self) -> dict:
+        return {
+            "degraded": self.degraded,
+            "fallback_voice": self.cfg.fallback_voice,
+            "synth_ms_ewma": round(self.synth_ms_ewma, 1) if self.synth_ms_ewma is not None else None,
+            "degraded_jobs": self.degraded_jobs,
+            "transitions": self.transitions,
+        }
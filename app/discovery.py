@@ -11,11 +11,13 @@ from zeroconf.asyncio import AsyncZeroconf
 
 log = logging.getLogger("bellphonics.discovery")
 
+SERVICE_TYPE = "_bellphonics._tcp.local."
+
 
 @dataclass(frozen=True)
 class DiscoveryConfig:
     enabled: bool
-    service_type: str = "_bellphonics._tcp.local."
+    service_type: str = SERVICE_TYPE
     instance_name: str = "Bellphonics"
     port: int = 8099
     host: str = ""  # if empty, infer local hostname
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Iterable, Literal, Optional
+
+log = logging.getLogger("bellphonics.jobs")
+
+
+JobState = Literal["queued", "synthesizing", "playing", "done", "dropped"]
+
+TERMINAL_STATES = frozenset({"done", "dropped"})
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _format_sse(evt: dict) -> str:
+    # No `id:` field: history keeps only each job's latest state, so there is
+    # nothing to resume from Last-Event-ID; reconnect with ?job_id=... instead
+    return f"event: {evt['state']}\ndata: {json.dumps(evt, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """
+    One event-stream consumer.
+    The buffer is bounded: when a slow consumer falls behind, the oldest
+    pending event is discarded so the publisher never waits.
+    """
+
+    def __init__(self, *, job_ids: Optional[set[str]], maxsize: int):
+        self.job_ids = job_ids  # None means "all jobs"
+        self.q: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def wants(self, job_id: str) -> bool:
+        return self.job_ids is None or job_id in self.job_ids
+
+    def offer(self, evt: dict) -> None:
+        if self.q.full():
+            try:
+                self.q.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self.dropped += 1
+        self.q.put_nowait(evt)
+
+
+class JobEvents:
+    """
+    Fan-out of job lifecycle events (queued -> synthesizing -> playing -> done | dropped).
+    Keeps the latest event for recent jobs so a client that subscribes after
+    POST /speak still learns the current state.
+    """
+
+    def __init__(self, *, buffer_size: int = 100, history_size: int = 256):
+        self.buffer_size = buffer_size
+        self.history_size = history_size
+        self._subs: set[Subscription] = set()
+        self._listeners: list[Callable[[dict], None]] = []  # in-process observers (e.g. traffic capture)
+        self._last: OrderedDict[str, dict] = OrderedDict()  # job_id -> latest event
+        self._by_event: dict[str, str] = {}  # event_id -> job_id (mirrors _last)
+
+    def publish(self, job_id: str, event_id: str, state: JobState, **data) -> None:
+        evt = {"job_id": job_id, "event_id": event_id, "state": state, "ts": time.time(), **data}
+
+        self._last[job_id] = evt
+        self._last.move_to_end(job_id)
+        self._by_event[event_id] = job_id
+        while len(self._last) > self.history_size:
+            _, old = self._last.popitem(last=False)
+            if self._by_event.get(old["event_id"]) == old["job_id"]:
+                self._by_event.pop(old["event_id"], None)
+
+        for sub in self._subs:
+            if sub.wants(job_id):
+                sub.offer(evt)
+
+        for listener in self._listeners:
+            try:
+                listener(evt)
+            except Exception:
+                log.exception("Job event listener failed")
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """Call `listener(evt)` synchronously for every published event. Keep it cheap."""
+        self._listeners.append(listener)
+
+    def last(self, job_id: str) -> Optional[dict]:
+        return self._last.get(job_id)
+
+    def job_for_event(self, event_id: str) -> Optional[str]:
+        return self._by_event.get(event_id)
+
+    def subscribe(self, job_ids: Optional[Iterable[str]] = None) -> Subscription:
+        ids = {j for j in job_ids if j} if job_ids else None
+        sub = Subscription(job_ids=ids or None, maxsize=self.buffer_size)
+        self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subs.discard(sub)
+
+    async def stream(self, job_ids: Optional[Iterable[str]] = None, *, keepalive_s: float = 15.0) -> AsyncIterator[str]:
+        """Yield Server-Sent Events frames until the client disconnects."""
+        sub = self.subscribe(job_ids)
+        reported_drops = 0
+        try:
+            # Replay current state for explicitly requested jobs
+            for jid in sorted(sub.job_ids or ()):
+                evt = self._last.get(jid)
+                if evt is not None:
+                    yield _format_sse(evt)
+
+            while True:
+                try:
+                    evt = await asyncio.wait_for(sub.q.get(), timeout=keepalive_s)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if sub.dropped != reported_drops:
+                    yield f": lagged, {sub.dropped - reported_drops} event(s) dropped\n\n"
+                    reported_drops = sub.dropped
+                yield _format_sse(evt)
+        finally:
+            self.unsubscribe(sub)
+            if sub.dropped:
+                log.info("Job event subscriber closed after dropping %d event(s)", sub.dropped)
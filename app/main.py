@@ -2,41 +2,78 @@ from __future__ import annotations
 
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, Header, HTTPException
+import json
 import logging
-import os
+from pathlib import Path
+from typing import Optional
 
+from .audio import build_sinks
+from .capture import TrafficCapture
 from .config import load_settings, Settings
 from .dedupe import DedupeGate
+from .degrade import DegradeConfig, DegradePolicy
 from .discovery import DiscoveryConfig, MdnsAdvertiser
+from .jobs import JobEvents
+from .phrasestore import PhraseStore
 from .queue import SpeechQueue
 from .security import SecurityConfig, SecurityGate
-from .tts.mock import MockTTS
+from .tracing import tracer
+from .tts.base import TTSEngine
+from .tts.factory import build_engine
 
 from . import api
 
 log = logging.getLogger("bellphonics")
 
 
-def create_app() -> FastAPI:
-    load_dotenv()
-    settings = load_settings()
-
-    # TTS backend selection (v1: mock only)
-    engine = MockTTS()
-    if settings.tts_backend == "sapi":
-        from .tts.sapi import WindowsSapiTTS
-        engine = WindowsSapiTTS()
-    elif settings.tts_backend == "piper":
-        from .tts.piper import PiperTTS
-        engine = PiperTTS(
-            voices_dir=settings.piper_voices_dir,
-            default_voice=settings.piper_default_voice,
-        )
+def create_app(settings: Optional[Settings] = None, *, engine: Optional[TTSEngine] = None) -> FastAPI:
+    """
+    Build the service. Settings default to the environment (and .env).
+    Passing an engine skips backend selection and the phrase store; app.replay
+    uses this to run a local instance on a simulated engine.
+    """
+    if settings is None:
+        load_dotenv()
+        settings = load_settings()
+
+    phrase_store = None
+    if engine is None:
+        phrase_store = PhraseStore.open(settings.phrase_store) if settings.phrase_store else None
+        engine = build_engine(settings, phrase_store=phrase_store)
+
+    tracer.configure(enabled=settings.trace_enabled, capacity=settings.trace_capacity)
 
     gate = DedupeGate(ttl_s=settings.dedupe_ttl_s)
-    speech_queue = SpeechQueue(engine=engine)
+    jobs = JobEvents(buffer_size=settings.job_events_buffer)
+    sinks = build_sinks(settings.sinks, backend=settings.tts_backend)
+
+    degrade = None
+    if settings.degrade_fallback_voice:
+        if settings.tts_backend == "piper":
+            # Piper quietly substitutes the default for a missing voice, which would make degrading a no-op
+            model_path = Path(settings.piper_voices_dir) / f"{settings.degrade_fallback_voice}.onnx"
+            if not model_path.exists():
+                raise RuntimeError(f"BELLPHONICS_DEGRADE_FALLBACK_VOICE model not found: {model_path}")
+        degrade = DegradePolicy(DegradeConfig(
+            fallback_voice=settings.degrade_fallback_voice,
+            queue_depth=settings.degrade_queue_depth,
+            synth_ms=settings.degrade_synth_ms,
+            recover_depth=settings.degrade_recover_depth,
+        ))
+        # The fallback must be ready before it is needed, or degrading would add a cold load
+        preload = getattr(engine, "preload", None)
+        if preload is not None:
+            preload(settings.degrade_fallback_voice)
+
+    speech_queue = SpeechQueue(engine=engine, events=jobs, sinks=sinks, degrade=degrade)
+    capture = TrafficCapture(settings.capture_path) if settings.capture_path else None
+    if capture is not None:
+        jobs.add_listener(capture.on_job_event)
 
     app = FastAPI(title="Bellphonics", version="0.1.0")
+    # In-process tooling (app.replay) follows jobs and samples the queue through these
+    app.state.queue = speech_queue
+    app.state.jobs = jobs
 
     # Dependencies
     def get_settings() -> Settings:
@@ -48,6 +85,12 @@ def create_app() -> FastAPI:
     def get_queue() -> SpeechQueue:
         return speech_queue
 
+    def get_jobs() -> JobEvents:
+        return jobs
+
+    def get_capture() -> TrafficCapture | None:
+        return capture
+
     def require_key(x_api_key: str | None = Header(default=None, alias="X-API-Key")) -> None:
         if not x_api_key or x_api_key.strip() != settings.api_key:
             raise HTTPException(status_code=401, detail="Unauthorized")
@@ -57,6 +100,8 @@ def create_app() -> FastAPI:
     app.dependency_overrides[api.get_settings] = get_settings
     app.dependency_overrides[api.get_gate] = get_gate
     app.dependency_overrides[api.get_queue] = get_queue
+    app.dependency_overrides[api.get_jobs] = get_jobs
+    app.dependency_overrides[api.get_capture] = get_capture
 
     # Apply auth to /speak only
     app.include_router(api.router, dependencies=[])
@@ -66,21 +111,19 @@ def create_app() -> FastAPI:
     # so simplest is to re-declare /speak here as a mounted dependency.)
     # Instead: enforce auth globally EXCEPT /health by adding a middleware.
     # For v1, we'll do a global dependency and carve out /health with an exception.
-    allow = os.getenv("BELLPHONICS_ALLOWLIST", "").strip()
-    allowlist = {ip.strip() for ip in allow.split(",") if ip.strip()}
     sec = SecurityGate(SecurityConfig(
         api_key=settings.api_key,
-        allowlist=allowlist,
-        rate_limit_per_min=int(os.getenv("BELLPHONICS_RATE_LIMIT_PER_MIN", "20")),
+        allowlist=set(settings.allowlist),
+        rate_limit_per_min=settings.rate_limit_per_min,
         dedupe_ttl_s=settings.dedupe_ttl_s,
     ))
     advertiser = MdnsAdvertiser(
         DiscoveryConfig(
-            enabled=(os.getenv("BELLPHONICS_DISCOVERY_ENABLED", "false").lower() == "true"),
-            instance_name=os.getenv("BELLPHONICS_DISCOVERY_NAME", "Bellphonics"),
-            host=os.getenv("BELLPHONICS_DISCOVERY_HOST", ""),
-            zone=os.getenv("BELLPHONICS_DISCOVERY_ZONE", ""),
-            subzone=os.getenv("BELLPHONICS_DISCOVERY_SUBZONE", ""),
+            enabled=settings.discovery_enabled,
+            instance_name=settings.discovery_name,
+            host=settings.discovery_host,
+            zone=settings.discovery_zone,
+            subzone=settings.discovery_subzone,
             port=settings.bind_port,
             txt={
                 "service": "bellphonics",
@@ -90,12 +133,30 @@ def create_app() -> FastAPI:
         )
     )
 
+    async def _capture_rate_limited(request) -> None:
+        # The handler never runs for rejected requests, so read the event here
+        try:
+            body = json.loads(await request.body())
+        except (ValueError, UnicodeDecodeError):
+            return
+        if isinstance(body, dict):
+            capture.record_arrival("rate_limited", body)
+
     @app.middleware("http")
     async def security_middleware(request, call_next):
-        resp = sec.middleware(request)
-        if resp is not None:
-            return resp
-        return await call_next(request)
+        # Only announcements get a trace; everything downstream inherits it via contextvars
+        token = tracer.start_trace(path=request.url.path) if request.url.path == "/speak" else None
+        try:
+            with tracer.span("security.middleware"):
+                resp = sec.middleware(request)
+            if resp is not None:
+                if capture is not None and resp.status_code == 429 and request.url.path == "/speak":
+                    await _capture_rate_limited(request)
+                return resp
+            with tracer.span("http.handler"):
+                return await call_next(request)
+        finally:
+            tracer.end_trace(token)
 
     @app.on_event("startup")
     async def _startup():
@@ -108,9 +169,20 @@ def create_app() -> FastAPI:
     async def _shutdown():
         await advertiser.stop()
         await speech_queue.stop()
+        if phrase_store is not None:
+            phrase_store.close()
+        if capture is not None:
+            capture.close()
         log.info("Bellphonics stopped")
 
     return app
 
 
-app = create_app()
+def __getattr__(name: str):
+    # `uvicorn app.main:app` builds the service on first access, so tools can
+    # import create_app without loading voices or requiring an API key
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
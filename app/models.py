@@ -15,6 +15,8 @@ class SpeechEvent(BaseModel):
     severity: Severity = "info"
 
     room: Optional[str] = None
+    # Broadcast: output sink names (or "*" for all sinks); synthesized once, played on all at once
+    targets: Optional[list[str]] = Field(default=None, min_length=1, max_length=32)
 
     cooldown_key: Optional[str] = None
     cooldown_s: Optional[int] = Field(default=None, ge=0, le=3600)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from .audio import Audio
+
+log = logging.getLogger("bellphonics.phrasestore")
+
+INDEX_NAME = "index.json"
+DATA_NAME = "audio.pcm"
+CURRENT_NAME = "CURRENT"  # names the live generation directory inside the store
+GENERATION_PREFIX = "gen-"
+FORMAT_VERSION = 3  # 2: backend and voice models; 3: generation directories, data length
+
+
+def _write_synced(path: Path, data: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def phrase_key(voice: str, text: str) -> str:
+    # Whitespace differences should not cause a miss
+    norm = " ".join(text.split())
+    return hashlib.sha1(f"{voice}\0{norm}".encode("utf-8")).hexdigest()
+
+
+def model_identity(model_path: str | Path) -> dict:
+    """Identify a voice model by content, so a store is tied to the exact model that rendered it."""
+    model_path = Path(model_path)
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"model": model_path.name, "size": model_path.stat().st_size, "sha256": digest.hexdigest()}
+
+
+class PhraseStore:
+    """
+    Read side of the pre-rendered phrase store: a JSON index plus one raw PCM
+    file, memory-mapped so renditions are paged in only when spoken.
+
+    On disk, each render is a generation directory that is never modified
+    after it is written; the CURRENT file names the live one:
+
+        phrasestore/CURRENT               -> "gen-k2x8f1"
+        phrasestore/gen-k2x8f1/index.json
+        phrasestore/gen-k2x8f1/audio.pcm
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        index: dict[str, dict],
+        data: mmap.mmap | bytes,
+        *,
+        backend: str = "",
+        voices: Optional[dict[str, dict]] = None,
+    ):
+        self.path = path
+        self.backend = backend  # engine that rendered the store, e.g. "piper" or "mock"
+        self.voices = voices or {}  # voice name -> model_identity() at render time
+        self._index = index
+        self._data = data
+
+    @classmethod
+    def open(cls, path: str | Path) -> "PhraseStore":
+        path = Path(path)
+        current = path / CURRENT_NAME
+        if not current.exists():
+            raise RuntimeError(f"Phrase store not found: {current} is missing; render it with app.prerender")
+        path = path / current.read_text(encoding="utf-8").strip()
+        index_path = path / INDEX_NAME
+        if not index_path.exists():
+            raise RuntimeError(f"Phrase store index not found: {index_path}")
+        with open(index_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise RuntimeError(
+                f"Unsupported phrase store version {meta.get('version')!r} in {index_path}; re-render it with app.prerender"
+            )
+
+        data_path = path / DATA_NAME
+        size = data_path.stat().st_size
+        if size != meta.get("data_length"):
+            raise RuntimeError(
+                f"Phrase store data {data_path} is {size} bytes but its index expects {meta.get('data_length')}; re-render it"
+            )
+        data: mmap.mmap | bytes = b""
+        if size > 0:
+            with open(data_path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        store = cls(path, meta["phrases"], data, backend=meta.get("backend", ""), voices=meta.get("voices"))
+        log.info("Loaded phrase store %s (%d phrases, rendered by %s)", path, len(store), store.backend)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def has(self, voice: str, text: str) -> bool:
+        return phrase_key(voice, text) in self._index
+
+    def get(self, voice: str, text: str) -> Optional[Audio]:
+        entry = self._index.get(phrase_key(voice, text))
+        if entry is None:
+            return None
+        start = entry["offset"]
+        return Audio(pcm=self._data[start:start + entry["length"]], sample_rate=entry["sample_rate"])
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+
+
+class PhraseStoreWriter:
+    """
+    Streams renditions into a new generation directory. close() makes it live
+    by atomically replacing the CURRENT pointer, so a running service keeps
+    its memory-mapped generation untouched and a crash mid-swap leaves the
+    previous store in place.
+    """
+
+    def __init__(self, path: str | Path, *, backend: str, voices: Optional[dict[str, dict]] = None):
+        self.path = Path(path)
+        self.backend = backend
+        self.voices = voices or {}
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.generation = Path(tempfile.mkdtemp(prefix=GENERATION_PREFIX, dir=self.path))
+        self._data = open(self.generation / DATA_NAME, "wb")
+        self._phrases: dict[str, dict] = {}
+        self._offset = 0
+
+    def add(self, voice: str, text: str, audio: Audio) -> None:
+        key = phrase_key(voice, text)
+        if key in self._phrases:
+            return
+        self._data.write(audio.pcm)
+        self._phrases[key] = {
+            "voice": voice,
+            "text": text,
+            "offset": self._offset,
+            "length": len(audio.pcm),
+            "sample_rate": audio.sample_rate,
+        }
+        self._offset += len(audio.pcm)
+
+    def close(self) -> None:
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        self._data.close()
+        meta = {
+            "version": FORMAT_VERSION,
+            "backend": self.backend,
+            "voices": self.voices,
+            "data_length": self._offset,
+            "phrases": self._phrases,
+        }
+        _write_synced(self.generation / INDEX_NAME, json.dumps(meta))
+
+        pointer_tmp = self.path / f"{CURRENT_NAME}.tmp"
+        _write_synced(pointer_tmp, self.generation.name)
+        os.replace(pointer_tmp, self.path / CURRENT_NAME)
+        self._prune()
+
+    def _prune(self) -> None:
+        # Best effort: a generation a running service still has mapped cannot be
+        # removed on Windows; it is retried after the next render
+        for old in self.path.glob(f"{GENERATION_PREFIX}*"):
+            if old != self.generation and old.is_dir():
+                shutil.rmtree(old, ignore_errors=True)
+
+    def discard(self) -> None:
+        """Drop everything written so far; the existing store is left untouched."""
+        self._data.close()
+        shutil.rmtree(self.generation, ignore_errors=True)
+
+    def __enter__(self) -> "PhraseStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._data.closed:
+            return  # already closed or discarded
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
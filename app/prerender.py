@@ -0,0 +1,168 @@
+"""
+Render a phrasebook into a phrase store the service loads at startup.
+
+Usage:
+    python -m app.prerender phrases.txt [--out DIR] [--workers N] [--threads-per-worker N] [--allow-partial]
+
+With BELLPHONICS_TTS_BACKEND=mock the run is a dry run: it writes silence to
+./phrasestore-mock unless --out is given, and the service refuses to load it.
+
+Phrasebook format: one phrase per line, optionally prefixed by a voice name
+and a tab. Lines without a voice use BELLPHONICS_PIPER_DEFAULT_VOICE; blank
+lines and lines starting with '#' are ignored.
+
+    en_GB-alba-medium<TAB>Delivery at the front door.
+    Someone is at the side entrance.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from .audio import Audio
+from .config import Settings, load_settings
+from .phrasestore import PhraseStoreWriter, model_identity, phrase_key
+from .tts.base import SynthesizingEngine
+from .tts.factory import build_engine
+
+log = logging.getLogger("bellphonics.prerender")
+
+# Per-process engine, created once by the pool initializer
+_engine: Optional[SynthesizingEngine] = None
+
+
+def read_phrasebook(path: str | Path, default_voice: str) -> list[tuple[str, str]]:
+    phrases: list[tuple[str, str]] = []
+    seen: set[str] = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            voice, sep, text = line.partition("\t")
+            if not sep:
+                voice, text = default_voice, line
+            voice, text = voice.strip() or default_voice, text.strip()
+            key = phrase_key(voice, text)
+            if text and key not in seen:
+                seen.add(key)
+                phrases.append((voice, text))
+    return phrases
+
+
+def _init_worker(settings: Settings) -> None:
+    global _engine
+    logging.basicConfig(level=logging.WARNING)
+    _engine = build_engine(settings)  # type: ignore[assignment]
+
+
+def _render(voice: str, text: str) -> Audio:
+    assert _engine is not None
+    return _engine.synthesize(text, voice=voice)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="bellphonics-prerender", description="Pre-render a phrasebook into a phrase store.")
+    parser.add_argument("phrasebook", help="phrasebook file (one phrase per line, optional 'voice<TAB>' prefix)")
+    parser.add_argument(
+        "--out",
+        help="output store directory (default: BELLPHONICS_PHRASE_STORE or ./phrasestore; ./phrasestore-mock with the mock backend)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="render processes (default: CPU count)")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="ONNX Runtime intra-op threads per process (default: 1)")
+    parser.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help="replace the store even if some phrases fail to render (default: leave it unchanged)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Rendering never serves requests, so it does not need the API key
+    load_dotenv()
+    settings = load_settings(require_api_key=False)
+
+    if settings.tts_backend not in ("piper", "mock"):
+        log.error("Backend %r cannot render to a buffer; use piper (or mock for a dry run)", settings.tts_backend)
+        return 2
+
+    if args.out:
+        out = args.out
+    elif settings.tts_backend == "mock":
+        # A dry run must never replace the live store with silence
+        out = "phrasestore-mock"
+    else:
+        out = settings.phrase_store or "phrasestore"
+
+    phrases = read_phrasebook(args.phrasebook, settings.piper_default_voice)
+    if not phrases:
+        log.error("No phrases found in %s", args.phrasebook)
+        return 1
+
+    # Record which models rendered the store, so the service can reject it after a model changes
+    voices: dict[str, dict] = {}
+    if settings.tts_backend == "piper":
+        for voice in sorted({voice for voice, _ in phrases}):
+            model_path = Path(settings.piper_voices_dir) / f"{voice}.onnx"
+            if not model_path.exists():
+                # Piper would silently render these with the default voice
+                log.error("Voice %s not found at %s", voice, model_path)
+                return 1
+            voices[voice] = model_identity(model_path)
+
+    # One core per process: pin ONNX Runtime threads so workers don't oversubscribe
+    render_settings = replace(
+        settings,
+        piper_intra_op_threads=args.threads_per_worker,
+        piper_inter_op_threads=1,
+        piper_warmup=False,
+        piper_voice_session_options={},
+    )
+    workers = max(1, min(args.workers, len(phrases)))
+    log.info("Rendering %d phrases with %d worker(s) into %s", len(phrases), workers, out)
+
+    started = time.perf_counter()
+    audio_s = 0.0
+    failed = 0
+    with PhraseStoreWriter(out, backend=settings.tts_backend, voices=voices) as writer, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(render_settings,)
+    ) as pool:
+        futures = {pool.submit(_render, voice, text): (voice, text) for voice, text in phrases}
+        for fut in as_completed(futures):
+            voice, text = futures[fut]
+            try:
+                audio = fut.result()
+            except Exception as e:
+                failed += 1
+                log.error("Failed to render %r with voice %s: %s", text, voice, e)
+                continue
+            writer.add(voice, text, audio)
+            audio_s += audio.duration_s
+        if failed and not args.allow_partial:
+            # A partial store would silently lose phrases the live one still has
+            writer.discard()
+    elapsed = time.perf_counter() - started
+
+    rendered = len(phrases) - failed
+    print(
+        f"Rendered {rendered}/{len(phrases)} phrases in {elapsed:.2f}s with {workers} worker(s): "
+        f"{rendered / elapsed:.1f} phrases/s, {audio_s:.1f}s of audio "
+        f"({audio_s / elapsed:.1f}x real time)"
+    )
+    if failed and not args.allow_partial:
+        log.error("%d phrase(s) failed; %s was left unchanged (use --allow-partial to keep the rest)", failed, out)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,23 +2,45 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, replace
+from functools import partial
 from typing import Optional
 
+from .audio import AudioSink, play_on
+from .degrade import DegradePolicy
+from .jobs import JobEvents, new_job_id
 from .models import SpeechEvent
-from .tts.base import TTSEngine
+from .tracing import tracer
+from .tts.base import PhaseCallback, TTSEngine
 
 log = logging.getLogger("bellphonics.queue")
 
 
+def _ms(start: float, end: float) -> float:
+    return round((end - start) * 1000.0, 1)
+
+
 @dataclass(frozen=True)
 class SpeakJob:
     event: SpeechEvent
+    job_id: str = field(default_factory=new_job_id)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    trace_id: Optional[str] = field(default_factory=tracer.current)
 
 
 class SpeechQueue:
-    def __init__(self, engine: TTSEngine):
+    def __init__(
+        self,
+        engine: TTSEngine,
+        events: Optional[JobEvents] = None,
+        sinks: Optional[dict[str, AudioSink]] = None,
+        degrade: Optional[DegradePolicy] = None,
+    ):
         self.engine = engine
+        self.events = events
+        self.sinks = sinks or {}
+        self.degrade = degrade
         self.q: asyncio.Queue[SpeakJob] = asyncio.Queue()
         self._task: Optional[asyncio.Task] = None
         self._stop = asyncio.Event()
@@ -35,18 +57,141 @@ class SpeechQueue:
             await asyncio.sleep(0)  # yield
             self._task.cancel()
             self._task = None
+        # Anything still waiting will never be spoken
+        while not self.q.empty():
+            job = self.q.get_nowait()
+            self._emit(job, "dropped", reason="shutdown")
+            self.q.task_done()
+
+    async def enqueue(self, event: SpeechEvent) -> str:
+        job = SpeakJob(event=event)
+        await self.q.put(job)
+        self._emit(job, "queued", queue_depth=self.q.qsize())
+        return job.job_id
+
+    def can_broadcast(self) -> bool:
+        """Broadcast needs an engine that renders to a buffer (Piper, mock; not SAPI)."""
+        return getattr(self.engine, "synthesize", None) is not None
+
+    def unknown_targets(self, targets: list[str]) -> list[str]:
+        return [t for t in targets if t != "*" and t not in self.sinks]
+
+    def resolve_targets(self, targets: list[str]) -> list[AudioSink]:
+        if "*" in targets:
+            return list(self.sinks.values())
+        # dict.fromkeys keeps order while dropping repeated names
+        return [self.sinks[t] for t in dict.fromkeys(targets) if t in self.sinks]
 
-    async def enqueue(self, event: SpeechEvent) -> None:
-        await self.q.put(SpeakJob(event=event))
+    def _apply_degrade(self, job: SpeakJob) -> tuple[SpeakJob, Optional[dict]]:
+        """Ask the degrade policy whether this job should use the fallback voice."""
+        if self.degrade is None:
+            return job, None
+        e = job.event
+        has_rendition = getattr(self.engine, "has_rendition", None)
+        decision = self.degrade.decide(
+            e,
+            depth=self.q.qsize(),
+            default_voice=getattr(self.engine, "default_voice", None),
+            cached=bool(has_rendition and has_rendition(e.text, voice=e.voice)),
+        )
+        if decision is None:
+            return job, None
+        log.info(
+            "Degrading event_id=%s voice %s -> %s (%s)",
+            e.event_id, decision["from"], decision["to"], decision["reason"],
+        )
+        return replace(job, event=e.model_copy(update={"voice": decision["to"]})), decision
+
+    def _emit(self, job: SpeakJob, state: str, **data) -> None:
+        if self.events is not None:
+            self.events.publish(job.job_id, job.event.event_id, state, **data)
 
     async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
         while not self._stop.is_set():
             job = await self.q.get()
+            started = time.perf_counter()
+            playing_at: list[float] = []
+
+            def on_phase(phase: str, job: SpeakJob = job) -> None:
+                if phase != "playing":
+                    return
+                now = time.perf_counter()
+                playing_at.append(now)
+                emit = partial(self._emit, job, "playing", synth_ms=_ms(started, now))
+                try:
+                    on_loop = asyncio.get_running_loop() is loop
+                except RuntimeError:
+                    on_loop = False
+                # Engines call this from their worker thread, so hop back onto the loop;
+                # broadcast calls it on the loop, where scheduling would let "done" overtake it
+                if on_loop:
+                    emit()
+                else:
+                    loop.call_soon_threadsafe(emit)
+
             try:
+                # Inside the try, so a policy error drops this job instead of killing the worker
+                job, degraded = self._apply_degrade(job)
                 e = job.event
-                log.info("Speaking event_id=%s severity=%s room=%s", e.event_id, e.severity, e.room)
-                self.engine.speak(e.text, voice=e.voice, volume=e.volume)
-            except Exception:
+                extra: dict = {"degraded": degraded} if degraded else {}
+                self._emit(job, "synthesizing", queue_wait_ms=_ms(job.enqueued_at, started), **extra)
+                log.info("Speaking event_id=%s job_id=%s severity=%s room=%s", e.event_id, job.job_id, e.severity, e.room)
+                with tracer.activate(job.trace_id):
+                    tracer.record("queue.wait", job.enqueued_at, started)
+                    if degraded:
+                        tracer.annotate(degraded_to=degraded["to"])
+                    if e.targets:
+                        extra.update(await self._broadcast(job, on_phase))
+                    else:
+                        with tracer.span("engine.speak"):
+                            # to_thread copies the context, so engine spans join this trace
+                            await asyncio.to_thread(self.engine.speak, e.text, voice=e.voice, volume=e.volume, on_phase=on_phase)
+                finished = time.perf_counter()
+                play_start = playing_at[0] if playing_at else finished
+                if self.degrade is not None:
+                    self.degrade.observe(_ms(started, play_start))
+                self._emit(
+                    job,
+                    "done",
+                    queue_wait_ms=_ms(job.enqueued_at, started),
+                    synth_ms=_ms(started, play_start),
+                    play_ms=_ms(play_start, finished),
+                    total_ms=_ms(job.enqueued_at, finished),
+                    **extra,
+                )
+            except asyncio.CancelledError:
+                self._emit(job, "dropped", reason="shutdown")
+                raise
+            except Exception as exc:
                 log.exception("Speech worker error")
+                self._emit(job, "dropped", reason="engine_error", error=str(exc))
             finally:
                 self.q.task_done()
+
+    async def _broadcast(self, job: SpeakJob, on_phase: PhaseCallback) -> dict:
+        """Synthesize once, then play the shared buffer on every target sink at the same time."""
+        e = job.event
+        sinks = self.resolve_targets(e.targets or [])
+        synthesize = getattr(self.engine, "synthesize", None)
+        if synthesize is None:
+            # /speak rejects this; never play a targeted event in whatever room the default device is in
+            raise RuntimeError("Engine cannot render to a buffer for broadcast")
+
+        with tracer.span("engine.synthesize"):
+            audio = await asyncio.to_thread(synthesize, e.text, voice=e.voice)
+        on_phase("playing")
+        with tracer.span("audio.broadcast", sinks=len(sinks)):
+            results = await asyncio.gather(
+                *(asyncio.to_thread(play_on, sink, audio, e.volume) for sink in sinks),
+                return_exceptions=True,
+            )
+
+        failed = []
+        for sink, result in zip(sinks, results):
+            if isinstance(result, BaseException):
+                log.error("Sink %s failed for event_id=%s: %s", sink.name, e.event_id, result)
+                failed.append(sink.name)
+        if sinks and len(failed) == len(sinks):
+            raise RuntimeError("All sinks failed")
+        return {"sinks": [sink.name for sink in sinks], "sinks_failed": failed}
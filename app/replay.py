@@ -0,0 +1,254 @@
+"""
+Replay captured /speak traffic against a local speech pipeline.
+
+Usage:
+    python -m app.replay capture.jsonl [--speed 10] [--engine latency|mock|configured]
+                         [--out report.json] [--compare baseline.json]
+
+Arrivals from the capture (BELLPHONICS_CAPTURE_PATH) are re-sent on their
+recorded schedule as /speak requests to a local, in-process instance of the
+service built by create_app() from the same .env: middleware, rate limiting,
+dedupe, sinks and the degrade policy all apply. The report gives queue depth
+over time and per-event latency in recorded time. Comparing two builds'
+reports shows the per-event latency deltas.
+
+Requires the `replay` extra: pip install -e .[replay]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from dataclasses import replace
+from typing import Any, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from .capture import ARRIVAL_OUTCOMES, read_capture
+from .config import Settings, load_settings
+from .jobs import TERMINAL_STATES
+from .main import create_app
+from .tts.base import TTSEngine
+from .tts.mock import MockTTS, SimulatedLatencyTTS
+
+log = logging.getLogger("bellphonics.replay")
+
+
+def schedule(records: list[dict[str, Any]], *, include_rate_limited: bool, max_gap_s: float) -> list[tuple[float, dict]]:
+    """Arrival offsets (seconds) from the first arrival, with idle gaps (e.g. restarts) capped at `max_gap_s`."""
+    wanted = ARRIVAL_OUTCOMES if include_rate_limited else ARRIVAL_OUTCOMES - {"rate_limited"}
+    arrivals = sorted((r for r in records if r.get("o") in wanted and "e" in r), key=lambda r: r["ts"])
+    out: list[tuple[float, dict]] = []
+    offset = 0.0
+    prev: Optional[float] = None
+    for r in arrivals:
+        if prev is not None:
+            offset += min(r["ts"] - prev, max_gap_s)
+        prev = r["ts"]
+        out.append((offset, r["e"]))
+    return out
+
+
+def _percentile(values: list[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return round(ordered[idx], 1)
+
+
+def _summary(values: list[float]) -> dict[str, Optional[float]]:
+    return {
+        "mean": round(statistics.fmean(values), 1) if values else None,
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "max": round(max(values), 1) if values else None,
+    }
+
+
+def replay_settings(settings: Settings, *, speed: float, simulated: bool) -> Settings:
+    """
+    Adapt service settings for a local replay instance. Everything that shapes
+    latency is kept; things with effects outside the process are turned off.
+    """
+    return replace(
+        settings,
+        api_key=settings.api_key or "replay",
+        capture_path="",  # never append the replay to a capture
+        discovery_enabled=False,
+        allowlist=frozenset(),  # captured arrivals already passed the allowlist
+        # The limiter counts wall-clock minutes, so scale it with the schedule
+        rate_limit_per_min=max(1, round(settings.rate_limit_per_min * speed)),
+        # A simulated engine has no real audio to play: sinks only log
+        **({"tts_backend": "mock", "phrase_store": ""} if simulated else {}),
+    )
+
+
+async def replay(
+    arrivals: list[tuple[float, dict]],
+    *,
+    settings: Settings,
+    engine: Optional[TTSEngine],
+    speed: float,
+    sample_ms: float = 100.0,
+) -> dict[str, Any]:
+    """
+    Replay `arrivals` against create_app(settings, engine=engine); None uses the configured backend.
+    Reported times are wall time * `speed`, so with speed != 1 the engine must be time-scaled as well.
+    """
+    app = create_app(settings, engine=engine)
+    q = app.state.queue
+
+    finished: dict[str, dict] = {}
+    app.state.jobs.add_listener(
+        lambda evt: finished.__setitem__(evt["event_id"], evt) if evt["state"] in TERMINAL_STATES else None
+    )
+
+    depth: list[tuple[float, int]] = []
+    started = 0.0
+
+    def recorded_now() -> float:
+        # Wall time scaled back to the capture's timeline
+        return (time.perf_counter() - started) * speed
+
+    async def sample() -> None:
+        while True:
+            depth.append((round(recorded_now(), 3), q.q.qsize()))
+            await asyncio.sleep(sample_ms / 1000.0 / speed)
+
+    outcomes = {"duplicates": 0, "invalid": 0, "rate_limited": 0, "rejected": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://replay", headers={"X-API-Key": settings.api_key}
+    ) as http:
+        # Start the clock after startup, so voice loading is not counted as backlog
+        started = time.perf_counter()
+        sampler = asyncio.create_task(sample())
+        try:
+            for offset, raw in arrivals:
+                delay = offset - recorded_now()
+                if delay > 0:
+                    await asyncio.sleep(delay / speed)
+                resp = await http.post("/speak", json=raw)
+                if resp.status_code == 200:
+                    if not resp.json().get("accepted"):
+                        outcomes["duplicates"] += 1
+                elif resp.status_code == 422:
+                    outcomes["invalid"] += 1
+                elif resp.status_code == 429:
+                    outcomes["rate_limited"] += 1
+                else:
+                    outcomes["rejected"] += 1
+                    log.warning("Replay /speak got HTTP %d: %s", resp.status_code, resp.text)
+            await q.q.join()
+        finally:
+            sampler.cancel()
+
+    latencies = {eid: round(evt.get("total_ms", 0.0) * speed, 1) for eid, evt in finished.items() if evt["state"] == "done"}
+    return {
+        "arrivals": len(arrivals),
+        "spoken": len(latencies),
+        "dropped": sum(1 for evt in finished.values() if evt["state"] == "dropped"),
+        **outcomes,
+        "speed": speed,
+        "duration_s": round(recorded_now(), 3),
+        "latency_ms": _summary(list(latencies.values())),
+        "queue_depth": {"max": max((d for _, d in depth), default=0), "series": depth},
+        "per_event_ms": latencies,
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], *, top: int = 10) -> dict[str, Any]:
+    """Per-event latency deltas (report - baseline) for events present in both."""
+    cur, base = report["per_event_ms"], baseline["per_event_ms"]
+    deltas = {eid: round(cur[eid] - base[eid], 1) for eid in cur.keys() & base.keys()}
+    worst = sorted(deltas.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "matched": len(deltas),
+        "delta_ms": _summary(list(deltas.values())),
+        "max_queue_depth": {"baseline": baseline["queue_depth"]["max"], "current": report["queue_depth"]["max"]},
+        "worst_regressions": [{"event_id": eid, "delta_ms": d} for eid, d in worst],
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="bellphonics-replay", description="Replay captured /speak traffic.")
+    parser.add_argument("capture", help="capture file written by BELLPHONICS_CAPTURE_PATH (.jsonl or .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (default: 1x)")
+    parser.add_argument(
+        "--engine",
+        choices=["latency", "mock", "configured"],
+        default="latency",
+        help="simulated-latency engine, instant MockTTS, or the backend from .env (plays on the configured sinks)",
+    )
+    parser.add_argument("--synth-base-ms", type=float, default=150.0)
+    parser.add_argument("--synth-ms-per-char", type=float, default=4.0)
+    parser.add_argument("--play-ms-per-char", type=float, default=60.0)
+    parser.add_argument("--include-rate-limited", action="store_true", help="also replay requests production rejected with 429")
+    parser.add_argument("--max-gap-s", type=float, default=5.0, help="cap idle gaps between arrivals (default: 5s)")
+    parser.add_argument("--sample-ms", type=float, default=100.0, help="queue depth sampling interval in recorded time")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline report to diff against")
+    args = parser.parse_args(argv)
+
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.engine == "configured" and args.speed != 1:
+        # Reported times are wall time * speed, which is only right when the engine is time-scaled too
+        parser.error("--engine configured runs at real speed; use --speed 1")
+    logging.basicConfig(level=logging.WARNING)
+
+    load_dotenv()
+    settings = load_settings(require_api_key=False)
+
+    arrivals = schedule(list(read_capture(args.capture)), include_rate_limited=args.include_rate_limited, max_gap_s=args.max_gap_s)
+    if not arrivals:
+        print(f"No arrivals in {args.capture}", file=sys.stderr)
+        return 1
+
+    engine: Optional[TTSEngine] = None
+    if args.engine == "latency":
+        engine = SimulatedLatencyTTS(
+            synth_base_ms=args.synth_base_ms,
+            synth_ms_per_char=args.synth_ms_per_char,
+            play_ms_per_char=args.play_ms_per_char,
+            time_scale=args.speed,
+        )
+    elif args.engine == "mock":
+        engine = MockTTS()
+
+    settings = replay_settings(settings, speed=args.speed, simulated=engine is not None)
+    report = asyncio.run(replay(arrivals, settings=settings, engine=engine, speed=args.speed, sample_ms=args.sample_ms))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    lat = report["latency_ms"]
+    print(
+        f"Replayed {report['arrivals']} arrivals at {args.speed:g}x over {report['duration_s']:.1f}s recorded time: "
+        f"{report['spoken']} spoken, {report['duplicates']} duplicate, {report['rate_limited']} rate limited, "
+        f"{report['dropped']} dropped; "
+        f"latency p50={lat['p50']}ms p95={lat['p95']}ms max={lat['max']}ms; "
+        f"max queue depth {report['queue_depth']['max']}"
+    )
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            diff = compare(report, json.load(f))
+        d = diff["delta_ms"]
+        print(
+            f"vs baseline ({diff['matched']} events): delta mean={d['mean']}ms p95={d['p95']}ms max={d['max']}ms; "
+            f"max queue depth {diff['max_queue_depth']['baseline']} -> {diff['max_queue_depth']['current']}"
+        )
+        for w in diff["worst_regressions"][:5]:
+            print(f"  {w['event_id']}: {w['delta_ms']:+.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import math
 import socket
 import time
 from dataclasses import dataclass
@@ -9,6 +10,8 @@ from typing import Optional
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+from .tracing import tracer
+
 log = logging.getLogger("bellphonics.security")
 
 
@@ -101,6 +104,10 @@ class SecurityGate:
         self._window_count += 1
         return self._window_count <= self.cfg.rate_limit_per_min
 
+    def retry_after_s(self) -> int:
+        """Whole seconds until the current rate window resets."""
+        return max(1, math.ceil(60 - (time.time() - self._window_start)))
+
     def check_event_id(self, event_id: Optional[str]) -> bool:
         if not event_id:
             return True  # let schema enforce required fields
@@ -118,7 +125,9 @@ class SecurityGate:
         # allowlist (supports both IPs and DNS names)
         ip = request.client.host if request.client else ""
         log.info(f"Checking allowlist for IP: {ip}, allowlist: {self.cfg.allowlist}")
-        if not self._check_allowlist(ip):
+        with tracer.span("security.allowlist"):
+            allowed = self._check_allowlist(ip)
+        if not allowed:
             log.warning(f"IP {ip} not in allowlist - returning 403")
             return JSONResponse(status_code=403, content={"detail": "Forbidden"})
 
@@ -128,7 +137,13 @@ class SecurityGate:
             return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
 
         # rate limit
-        if not self.check_rate():
-            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+        with tracer.span("security.rate_limit"):
+            within_rate = self.check_rate()
+        if not within_rate:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"},
+                headers={"Retry-After": str(self.retry_after_s())},
+            )
 
         return None
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+log = logging.getLogger("bellphonics.tracing")
+
+_current_trace: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("bellphonics_trace", default=None)
+
+
+class _NoopSpan:
+    """Returned whenever tracing is off so instrumented code pays ~nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_trace_id", "name", "attrs", "_start")
+
+    def __init__(self, tracer: "Tracer", trace_id: str, name: str, attrs: dict):
+        self._tracer = tracer
+        self._trace_id = trace_id
+        self.name = name
+        self.attrs = attrs
+        self._start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self._tracer.record(self.name, self._start, time.perf_counter(), trace_id=self._trace_id, **self.attrs)
+        return False
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+@dataclass
+class _Trace:
+    trace_id: str
+    started_wall: float
+    started: float  # perf_counter
+    attrs: dict = field(default_factory=dict)
+    spans: list[tuple[str, float, float, dict]] = field(default_factory=list)
+
+
+class Tracer:
+    """
+    Per-event span timelines kept in a fixed-size ring buffer.
+    The active trace follows the request through contextvars, so spans recorded
+    in the middleware, the API handler, the speech worker and engine threads
+    all land on the same timeline.
+    """
+
+    def __init__(self, *, enabled: bool = False, capacity: int = 200, max_spans_per_trace: int = 64):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.max_spans_per_trace = max_spans_per_trace
+        self._traces: OrderedDict[str, _Trace] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, *, enabled: Optional[bool] = None, capacity: Optional[int] = None) -> None:
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if capacity is not None:
+                self.capacity = max(1, capacity)
+                while len(self._traces) > self.capacity:
+                    self._traces.popitem(last=False)
+
+    def start_trace(self, **attrs) -> Optional[contextvars.Token]:
+        """Begin a new trace in the current context. Returns None when tracing is off."""
+        if not self.enabled:
+            return None
+        trace = _Trace(trace_id=uuid.uuid4().hex, started_wall=time.time(), started=time.perf_counter(), attrs=attrs)
+        with self._lock:
+            self._traces[trace.trace_id] = trace
+            while len(self._traces) > self.capacity:
+                self._traces.popitem(last=False)
+        return _current_trace.set(trace.trace_id)
+
+    def end_trace(self, token: Optional[contextvars.Token]) -> None:
+        if token is not None:
+            _current_trace.reset(token)
+
+    def current(self) -> Optional[str]:
+        return _current_trace.get() if self.enabled else None
+
+    @contextmanager
+    def activate(self, trace_id: Optional[str]) -> Iterator[None]:
+        """Re-enter a trace captured elsewhere (e.g. on a queued job)."""
+        if trace_id is None:
+            yield
+            return
+        token = _current_trace.set(trace_id)
+        try:
+            yield
+        finally:
+            _current_trace.reset(token)
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return _NOOP
+        trace_id = _current_trace.get()
+        if trace_id is None:
+            return _NOOP
+        return _Span(self, trace_id, name, attrs)
+
+    def record(self, name: str, start: float, end: float, *, trace_id: Optional[str] = None, **attrs) -> None:
+        """Record a span from perf_counter timestamps (for intervals measured elsewhere)."""
+        if not self.enabled:
+            return
+        trace_id = trace_id or _current_trace.get()
+        if trace_id is None:
+            return
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is not None and len(trace.spans) < self.max_spans_per_trace:
+                trace.spans.append((name, start, end, attrs))
+
+    def annotate(self, **attrs) -> None:
+        """Attach attributes (event_id, job_id, ...) to the current trace."""
+        if not self.enabled:
+            return
+        trace_id = _current_trace.get()
+        if trace_id is None:
+            return
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is not None:
+                trace.attrs.update(attrs)
+
+    def timelines(self, *, limit: int = 20, event_id: Optional[str] = None) -> list[dict]:
+        """Most recent traces first, with span offsets relative to trace start."""
+        with self._lock:
+            traces = list(reversed(self._traces.values()))
+            if event_id is not None:
+                traces = [t for t in traces if t.attrs.get("event_id") == event_id]
+            traces = traces[: max(0, limit)]
+            snapshot = [(t, list(t.spans)) for t in traces]
+
+        out = []
+        for t, spans in snapshot:
+            spans.sort(key=lambda s: s[1])
+            end = max((s[2] for s in spans), default=t.started)
+            out.append({
+                "trace_id": t.trace_id,
+                "ts": t.started_wall,
+                **t.attrs,
+                "total_ms": round((end - t.started) * 1000.0, 3),
+                "spans": [
+                    {
+                        "name": name,
+                        "offset_ms": round((start - t.started) * 1000.0, 3),
+                        "duration_ms": round((stop - start) * 1000.0, 3),
+                        **attrs,
+                    }
+                    for name, start, stop, attrs in spans
+                ],
+            })
+        return out
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"enabled": self.enabled, "capacity": self.capacity, "traces": len(self._traces)}
+
+
+class SamplingProfiler:
+    """
+    Opt-in wall-clock sampler. Runs in a daemon thread for a bounded window,
+    periodically snapshotting every thread's stack via sys._current_frames()
+    and counting collapsed stacks (flamegraph.pl compatible).
+    """
+
+    MAX_SECONDS = 300
+    MAX_DEPTH = 64
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.interval_s = 0.005
+        self.started_at: Optional[float] = None
+        self.until: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, *, interval_ms: float = 5.0) -> bool:
+        """Start sampling for `seconds`. Returns False if a session is already running."""
+        with self._lock:
+            if self.running:
+                return False
+            seconds = max(0.1, min(float(seconds), self.MAX_SECONDS))
+            self.interval_s = max(0.001, interval_ms / 1000.0)
+            self._stacks = Counter()
+            self.samples = 0
+            self.started_at = time.time()
+            self.until = self.started_at + seconds
+            self._thread = threading.Thread(target=self._run, name="bellphonics-profiler", daemon=True)
+            self._thread.start()
+        log.info("Sampling profiler started for %.1fs (interval %.1fms)", seconds, self.interval_s * 1000.0)
+        return True
+
+    def _collapse(self, frame) -> str:
+        parts = []
+        while frame is not None and len(parts) < self.MAX_DEPTH:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        until = self.until or 0.0
+        while time.time() < until:
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, frame in frames.items():
+                    if ident != me:
+                        self._stacks[self._collapse(frame)] += 1
+                self.samples += 1
+            time.sleep(self.interval_s)
+        log.info("Sampling profiler finished: %d samples", self.samples)
+
+    def report(self, *, top: int = 50) -> dict:
+        with self._lock:
+            stacks = self._stacks.most_common(max(0, top))
+            return {
+                "running": self.running,
+                "started_at": self.started_at,
+                "until": self.until,
+                "interval_ms": round(self.interval_s * 1000.0, 3),
+                "samples": self.samples,
+                "stacks": [{"stack": s, "count": n} for s, n in stacks],
+            }
+
+
+tracer = Tracer()
+profiler = SamplingProfiler()
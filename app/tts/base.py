@@ -1,7 +1,27 @@
 from __future__ import annotations
 
-from typing import Protocol, Optional
+from typing import TYPE_CHECKING, Callable, Protocol, Optional
+
+if TYPE_CHECKING:
+    from ..audio import Audio
+
+
+# Engines call this (from the speech worker thread) when playback begins.
+PhaseCallback = Callable[[str], None]
 
 
 class TTSEngine(Protocol):
-    def speak(self, text: str, *, voice: Optional[str] = None, volume: Optional[float] = None) -> None: ...
+    def speak(
+        self,
+        text: str,
+        *,
+        voice: Optional[str] = None,
+        volume: Optional[float] = None,
+        on_phase: Optional[PhaseCallback] = None,
+    ) -> None: ...
+
+
+class SynthesizingEngine(TTSEngine, Protocol):
+    """Engines that can render to a buffer; required for broadcast to multiple sinks."""
+
+    def synthesize(self, text: str, *, voice: Optional[str] = None) -> "Audio": ...
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Optional
+
+from ..config import Settings
+from .base import TTSEngine
+from .mock import MockTTS
+
+if TYPE_CHECKING:
+    from ..phrasestore import PhraseStore
+
+
+def build_engine(settings: Settings, *, phrase_store: Optional["PhraseStore"] = None) -> TTSEngine:
+    """TTS backend selection, shared by the service and the pre-render CLI."""
+    if settings.tts_backend == "sapi":
+        from .sapi import WindowsSapiTTS
+        return WindowsSapiTTS()
+
+    if settings.tts_backend == "piper":
+        from .piper import PiperSessionOptions, PiperTTS
+        session_options = PiperSessionOptions(
+            intra_op_threads=settings.piper_intra_op_threads,
+            inter_op_threads=settings.piper_inter_op_threads,
+            graph_opt_level=settings.piper_graph_opt_level,
+            cpu_mem_arena=settings.piper_cpu_mem_arena,
+        )
+        return PiperTTS(
+            voices_dir=settings.piper_voices_dir,
+            default_voice=settings.piper_default_voice,
+            session_options=session_options,
+            # Overrides start from the global settings, so only changed keys need listing
+            voice_session_options={
+                name: replace(session_options, **opts)
+                for name, opts in settings.piper_voice_session_options.items()
+            },
+            warmup=settings.piper_warmup,
+            preload_voices=settings.piper_preload_voices,
+            phrase_store=phrase_store,
+        )
+
+    return MockTTS()
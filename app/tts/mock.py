@@ -1,11 +1,74 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Optional
 
+from ..audio import Audio
+from .base import PhaseCallback
+
 log = logging.getLogger("bellphonics.tts.mock")
 
 
 class MockTTS:
-    def speak(self, text: str, *, voice: Optional[str] = None, volume: Optional[float] = None) -> None:
+    sample_rate = 16000
+
+    def synthesize(self, text: str, *, voice: Optional[str] = None) -> Audio:
+        # Silence roughly as long as the phrase would take to say (~60ms per character)
+        frames = int(len(text) * 0.06 * self.sample_rate)
+        log.info("[MOCK SYNTH] voice=%s text=%r", voice, text)
+        return Audio(pcm=bytes(frames * 2), sample_rate=self.sample_rate)
+
+    def speak(
+        self,
+        text: str,
+        *,
+        voice: Optional[str] = None,
+        volume: Optional[float] = None,
+        on_phase: Optional[PhaseCallback] = None,
+    ) -> None:
+        if on_phase:
+            on_phase("playing")
         log.info("[MOCK SPEAK] voice=%s volume=%s text=%r", voice, volume, text)
+
+
+class SimulatedLatencyTTS(MockTTS):
+    """
+    Mock engine that takes as long as a real one: a fixed plus per-character
+    synthesis cost, then playback proportional to text length. Deterministic,
+    so replays differ only by the code under test. `time_scale` > 1 runs
+    proportionally faster for accelerated replay.
+    """
+
+    def __init__(
+        self,
+        *,
+        synth_base_ms: float = 150.0,
+        synth_ms_per_char: float = 4.0,
+        play_ms_per_char: float = 60.0,
+        time_scale: float = 1.0,
+    ):
+        self.synth_base_ms = synth_base_ms
+        self.synth_ms_per_char = synth_ms_per_char
+        self.play_ms_per_char = play_ms_per_char
+        self.time_scale = time_scale
+
+    def _sleep_ms(self, ms: float) -> None:
+        time.sleep(ms / 1000.0 / self.time_scale)
+
+    def synthesize(self, text: str, *, voice: Optional[str] = None) -> Audio:
+        self._sleep_ms(self.synth_base_ms + self.synth_ms_per_char * len(text))
+        return super().synthesize(text, voice=voice)
+
+    def speak(
+        self,
+        text: str,
+        *,
+        voice: Optional[str] = None,
+        volume: Optional[float] = None,
+        on_phase: Optional[PhaseCallback] = None,
+    ) -> None:
+        self._sleep_ms(self.synth_base_ms + self.synth_ms_per_char * len(text))
+        if on_phase:
+            on_phase("playing")
+        self._sleep_ms(self.play_ms_per_char * len(text))
@@ -1,36 +1,147 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import Optional
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 import tempfile
-import winsound
 import wave
 
+import onnxruntime
 from piper import PiperVoice
+from piper.config import PiperConfig
+
+from ..audio import Audio
+from ..phrasestore import model_identity
+from ..tracing import tracer
+from .base import PhaseCallback
+
+if TYPE_CHECKING:
+    from ..phrasestore import PhraseStore
 
 log = logging.getLogger("bellphonics.tts.piper")
 
 
+_GRAPH_OPT_LEVELS = {
+    "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+WARMUP_TEXT = "Warm up."
+
+
+@dataclass(frozen=True)
+class PiperSessionOptions:
+    """
+    ONNX Runtime session settings for one voice.
+    Zero thread counts leave the choice to ONNX Runtime (one thread per core),
+    which oversubscribes small ARM boards.
+    """
+
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    graph_opt_level: str = "all"  # disable | basic | extended | all
+    cpu_mem_arena: bool = True
+
+    def __post_init__(self):
+        if self.graph_opt_level not in _GRAPH_OPT_LEVELS:
+            raise RuntimeError(
+                f"Unknown Piper graph optimization level {self.graph_opt_level!r} "
+                f"(expected one of: {', '.join(_GRAPH_OPT_LEVELS)})"
+            )
+
+    def to_session_options(self) -> onnxruntime.SessionOptions:
+        opts = onnxruntime.SessionOptions()
+        opts.intra_op_num_threads = self.intra_op_threads
+        opts.inter_op_num_threads = self.inter_op_threads
+        opts.graph_optimization_level = _GRAPH_OPT_LEVELS[self.graph_opt_level]
+        opts.enable_cpu_mem_arena = self.cpu_mem_arena
+        return opts
+
+
+@dataclass
+class VoiceStats:
+    load_ms: float
+    cold_inference_ms: Optional[float] = None  # first inference (warm-up or first announcement)
+    warm_count: int = 0
+    warm_total_ms: float = 0.0
+    warm_last_ms: Optional[float] = None
+
+    def record_inference(self, ms: float) -> None:
+        if self.cold_inference_ms is None:
+            self.cold_inference_ms = ms
+            return
+        self.warm_count += 1
+        self.warm_total_ms += ms
+        self.warm_last_ms = ms
+
+    def as_dict(self) -> dict:
+        return {
+            "load_ms": self.load_ms,
+            "cold_inference_ms": self.cold_inference_ms,
+            "warm_count": self.warm_count,
+            "warm_avg_ms": round(self.warm_total_ms / self.warm_count, 1) if self.warm_count else None,
+            "warm_last_ms": self.warm_last_ms,
+        }
+
+
 class PiperTTS:
     """
     Piper TTS using the piper-tts Python package with support for multiple voices.
     """
 
-    def __init__(self, *, voices_dir: str, default_voice: str):
+    def __init__(
+        self,
+        *,
+        voices_dir: str,
+        default_voice: str,
+        session_options: Optional[PiperSessionOptions] = None,
+        voice_session_options: Optional[dict[str, PiperSessionOptions]] = None,
+        warmup: bool = False,
+        preload_voices: tuple[str, ...] = (),
+        phrase_store: Optional["PhraseStore"] = None,
+    ):
         self.voices_dir = Path(voices_dir)
         self.default_voice = default_voice
+        self.session_options = session_options or PiperSessionOptions()
+        self.voice_session_options = voice_session_options or {}
+        self.warmup = warmup
+        self.phrase_store = phrase_store
         self.loaded_voices: dict[str, PiperVoice] = {}
+        self.voice_stats: dict[str, VoiceStats] = {}
         
         if not self.voices_dir.exists():
             raise RuntimeError(f"Piper voices directory not found: {self.voices_dir}")
+        if phrase_store is not None:
+            self._check_phrase_store(phrase_store)
         
-        # Pre-load the default voice
-        self._load_voice(default_voice)
+        # Pre-load the default voice and any configured extras
+        self._load_voice(default_voice, warm=True)
+        for name in preload_voices:
+            self._load_voice(name, warm=True)
         log.info(f"Piper TTS initialized with default voice: {default_voice}")
 
-    def _load_voice(self, voice_name: str) -> PiperVoice:
-        """Load a voice model by name. Caches loaded voices."""
+    def _check_phrase_store(self, store: "PhraseStore") -> None:
+        """Refuse a store rendered by another backend (e.g. a mock dry run) or by different voice models."""
+        if store.backend != "piper":
+            raise RuntimeError(f"Phrase store {store.path} was rendered by backend {store.backend!r}, not piper")
+        for name, identity in store.voices.items():
+            model_path = self.voices_dir / f"{name}.onnx"
+            if not model_path.exists() or model_identity(model_path) != identity:
+                raise RuntimeError(
+                    f"Phrase store {store.path} was rendered with a different {name} model than {model_path}; re-render it"
+                )
+
+    def _load_voice(self, voice_name: str, *, warm: bool = False) -> PiperVoice:
+        """
+        Load a voice model by name. Caches loaded voices.
+        Warm-up only runs for startup loads (`warm`); a lazy load from the
+        worker already pays for a cold inference on the job that needed it.
+        """
         if voice_name in self.loaded_voices:
             return self.loaded_voices[voice_name]
         
@@ -38,41 +149,116 @@ class PiperTTS:
         if not model_path.exists():
             log.warning(f"Voice '{voice_name}' not found at {model_path}, falling back to default")
             if voice_name != self.default_voice:
-                return self._load_voice(self.default_voice)
+                return self._load_voice(self.default_voice, warm=warm)
             raise RuntimeError(f"Default voice not found: {model_path}")
         
-        voice = PiperVoice.load(model_path)
+        opts = self.voice_session_options.get(voice_name, self.session_options)
+        started = time.perf_counter()
+        with tracer.span("piper.load_voice", voice=voice_name):
+            voice = self._open_voice(model_path, opts)
+        stats = VoiceStats(load_ms=round((time.perf_counter() - started) * 1000.0, 1))
         self.loaded_voices[voice_name] = voice
-        log.info(f"Loaded Piper voice: {voice_name}")
+        self.voice_stats[voice_name] = stats
+        log.info(f"Loaded Piper voice: {voice_name} in {stats.load_ms}ms ({opts})")
+
+        if warm and self.warmup:
+            # Pay ONNX Runtime's first-run initialization here instead of on the first announcement
+            self._infer(voice, WARMUP_TEXT, stats)
+            log.info(f"Warmed up Piper voice: {voice_name} in {stats.cold_inference_ms}ms")
         return voice
 
-    def speak(self, text: str, *, voice: Optional[str] = None, volume: Optional[float] = None) -> None:
+    def _open_voice(self, model_path: Path, opts: PiperSessionOptions) -> PiperVoice:
+        if opts == PiperSessionOptions():
+            return PiperVoice.load(model_path)
+
+        # PiperVoice.load always uses default session options, so build the session ourselves
+        config_path = Path(f"{model_path}.json")
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = PiperConfig.from_dict(json.load(f))
+        session = onnxruntime.InferenceSession(
+            str(model_path),
+            sess_options=opts.to_session_options(),
+            providers=["CPUExecutionProvider"],
+        )
+        return PiperVoice(session=session, config=config)
+
+    def _infer(self, piper_voice: PiperVoice, text: str, stats: Optional[VoiceStats]) -> bytes:
+        started = time.perf_counter()
+        pcm = b"".join(chunk.audio_int16_bytes for chunk in piper_voice.synthesize(text))
+        if stats is not None:
+            stats.record_inference(round((time.perf_counter() - started) * 1000.0, 1))
+        return pcm
+
+    def preload(self, voice_name: str) -> None:
+        """Load (and warm up, if enabled) a voice ahead of its first use."""
+        self._load_voice(voice_name, warm=True)
+
+    def has_rendition(self, text: str, *, voice: Optional[str] = None) -> bool:
+        """True when the phrase store can serve this text without inference."""
+        return self.phrase_store is not None and self.phrase_store.has(voice or self.default_voice, text)
+
+    def stats(self) -> dict:
+        return {name: st.as_dict() for name, st in self.voice_stats.items()}
+
+    def synthesize(self, text: str, *, voice: Optional[str] = None) -> Audio:
+        """Render text to PCM without playing it."""
+        # Use specified voice or fall back to default
+        voice_name = voice or self.default_voice
+
+        if self.phrase_store is not None:
+            with tracer.span("phrasestore.lookup", voice=voice_name) as span:
+                audio = self.phrase_store.get(voice_name, text)
+                span.set(hit=audio is not None)
+            if audio is not None:
+                return audio
+
+        piper_voice = self._load_voice(voice_name)
+
+        # A missing voice falls back to the default, so attribute timings accordingly
+        stats = self.voice_stats.get(voice_name) or self.voice_stats.get(self.default_voice)
+        with tracer.span("piper.inference", voice=voice_name) as span:
+            pcm = self._infer(piper_voice, text, stats)
+            span.set(bytes=len(pcm))
+        return Audio(pcm=pcm, sample_rate=piper_voice.config.sample_rate)
+
+    def speak(
+        self,
+        text: str,
+        *,
+        voice: Optional[str] = None,
+        volume: Optional[float] = None,
+        on_phase: Optional[PhaseCallback] = None,
+    ) -> None:
         text = (text or "").strip()
         if not text:
             return
 
-        # Use specified voice or fall back to default
+        # Windows-only; imported here so synthesize() (broadcast, pre-render) works on other platforms
+        import winsound
+
         voice_name = voice or self.default_voice
-        piper_voice = self._load_voice(voice_name)
 
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
             wav_path = f.name
 
         try:
-            # Synthesize returns an iterable of AudioChunk objects
-            # We need to write them to a WAV file
-            with wave.open(wav_path, "wb") as wav_file:
-                wav_file.setnchannels(1)  # mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(piper_voice.config.sample_rate)
-                
-                for audio_chunk in piper_voice.synthesize(text):
-                    wav_file.writeframes(audio_chunk.audio_int16_bytes)
+            audio = self.synthesize(text, voice=voice_name)
+
+            with tracer.span("piper.wav_write"):
+                with wave.open(wav_path, "wb") as wav_file:
+                    wav_file.setnchannels(audio.channels)
+                    wav_file.setsampwidth(audio.sample_width)
+                    wav_file.setframerate(audio.sample_rate)
+                    wav_file.writeframes(audio.pcm)
             
             log.info(f"Synthesized '{text[:50]}...' using voice '{voice_name}'")
-            winsound.PlaySound(wav_path, winsound.SND_FILENAME)
+            if on_phase:
+                on_phase("playing")
+            with tracer.span("piper.playback"):
+                winsound.PlaySound(wav_path, winsound.SND_FILENAME)
         except Exception as e:
             log.exception(f"Error during synthesis: {e}")
+            raise
         finally:
             try:
                 Path(wav_path).unlink()
@@ -4,6 +4,9 @@ from __future__ import annotations
 import subprocess
 from typing import Optional
 
+from ..tracing import tracer
+from .base import PhaseCallback
+
 
 class WindowsSapiTTS:
     """
@@ -12,7 +15,14 @@ class WindowsSapiTTS:
     Cons: Windows-only.
     """
 
-    def speak(self, text: str, *, voice: Optional[str] = None, volume: Optional[float] = None) -> None:
+    def speak(
+        self,
+        text: str,
+        *,
+        voice: Optional[str] = None,
+        volume: Optional[float] = None,
+        on_phase: Optional[PhaseCallback] = None,
+    ) -> None:
         safe = text.replace('"', '`"')
 
         # volume: float 0..1 -> SAPI 0..100
@@ -39,9 +49,14 @@ $s = New-Object System.Speech.Synthesis.SpeechSynthesizer
 $s.Speak("{safe}")
 """
 
-        subprocess.run(
-            ["powershell", "-NoProfile", "-NonInteractive", "-Command", ps],
-            check=False,
-            capture_output=True,
-            text=True,
-        )
+        # SAPI synthesizes and plays in one call; report playback as it starts
+        if on_phase:
+            on_phase("playing")
+
+        with tracer.span("sapi.speak"):
+            subprocess.run(
+                ["powershell", "-NoProfile", "-NonInteractive", "-Command", ps],
+                check=False,
+                capture_output=True,
+                text=True,
+            )